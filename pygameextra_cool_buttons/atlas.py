@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+import pygame
+import pygameextra.settings as settings
+
+# Share of the atlas kept when a full atlas is repacked, the least recently used rest is evicted
+REPACK_FILL = .5
+
+
+class Shelf:
+    __slots__ = ('y', 'height', 'x')
+
+    def __init__(self, y: int, height: int):
+        self.y = y
+        self.height = height
+        self.x = 0
+
+
+class AtlasPage:
+    def __init__(self, size: int):
+        self.size = size
+        self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.shelves: List[Shelf] = []
+        self.bottom = 0
+
+    def allocate(self, width: int, height: int) -> Optional[pygame.Rect]:
+        if width > self.size or height > self.size:
+            return None
+        # Best fit among shelves tall enough, so small sprites don't waste tall shelves
+        best = None
+        for shelf in self.shelves:
+            if shelf.height >= height and self.size - shelf.x >= width and \
+                    (best is None or shelf.height < best.height):
+                best = shelf
+        if best is None:
+            if self.size - self.bottom < height:
+                return None
+            best = Shelf(self.bottom, height)
+            self.shelves.append(best)
+            self.bottom += height
+        rect = pygame.Rect(best.x, best.y, width, height)
+        best.x += width
+        return rect
+
+
+class Atlas:
+    def __init__(self, size_setting: str, pages_setting: str):
+        self.size_setting = size_setting
+        self.pages_setting = pages_setting
+        self.pages: List[AtlasPage] = []
+        self.items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.repacks = 0
+
+    @property
+    def page_size(self) -> int:
+        return getattr(settings, self.size_setting)
+
+    @property
+    def max_pages(self) -> int:
+        return getattr(settings, self.pages_setting)
+
+    def _allocate(self, width: int, height: int) -> Optional[Tuple[AtlasPage, pygame.Rect]]:
+        for page in self.pages:
+            if (rect := page.allocate(width, height)) is not None:
+                return page, rect
+        if len(self.pages) < self.max_pages:
+            self.pages.append(page := AtlasPage(self.page_size))
+            if (rect := page.allocate(width, height)) is not None:
+                return page, rect
+        return None
+
+    @staticmethod
+    def _copy(source: pygame.Surface, page: AtlasPage, rect: pygame.Rect, area: pygame.Rect = None):
+        # Max against the cleared page copies the pixels as they are, a normal blit would blend them
+        page.surface.blit(source, rect, area, special_flags=pygame.BLEND_RGBA_MAX)
+
+    def repack(self):
+        self.repacks += 1
+        capacity = self.page_size ** 2 * self.max_pages * REPACK_FILL
+        kept, used = [], 0
+        for key, (page, rect) in reversed(self.items.items()):
+            if used + rect.width * rect.height > capacity:
+                self.evictions += 1
+                continue
+            used += rect.width * rect.height
+            kept.append((key, page, rect))
+        old_pages = self.pages
+        self.pages = []
+        self.items.clear()
+        # Tallest first packs shelves tightly, insertion order is restored afterwards for the LRU
+        placed = {}
+        for key, page, rect in sorted(kept, key=lambda item: item[2].height, reverse=True):
+            if (allocation := self._allocate(rect.width, rect.height)) is None:
+                self.evictions += 1
+                continue
+            self._copy(page.surface, *allocation, rect)
+            placed[key] = allocation
+        for key, _, _ in reversed(kept):
+            if key in placed:
+                self.items[key] = placed[key]
+        del old_pages
+
+    def get(self, key: Hashable, factory: Callable[[], pygame.Surface]) -> Tuple[pygame.Surface, Any]:
+        try:
+            page, rect = self.items[key]
+        except KeyError:
+            self.misses += 1
+            surface = factory()
+            width, height = surface.get_size()
+            if (allocation := self._allocate(width, height)) is None:
+                self.repack()
+                allocation = self._allocate(width, height)
+            if allocation is None:
+                # Larger than a whole page, it's drawn on its own
+                return surface, None
+            self._copy(surface, *allocation)
+            self.items[key] = allocation
+            page, rect = allocation
+            return page.surface, rect
+        self.hits += 1
+        self.items.move_to_end(key)
+        return page.surface, rect
+
+    def clear(self):
+        self.pages.clear()
+        self.items.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.repacks = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key: Hashable):
+        return key in self.items
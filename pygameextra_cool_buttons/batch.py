@@ -0,0 +1,129 @@
+from functools import wraps
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import pygame
+import pygameextra
+import pygameextra.settings as settings
+from pygameextra import display, math
+from pygameextra.rect import Rect
+
+from pygameextra_cool_buttons import frame
+
+
+class Command(NamedTuple):
+    target: pygameextra.Surface
+    layer: int
+    style: int
+    order: int
+    button: object
+    visual_args: tuple
+    text_area: tuple
+    text: pygameextra.Text
+    bounds: Rect
+
+
+commands: List[Command] = []
+styles: Dict[object, int] = {}
+blits: List[Tuple[pygame.Surface, tuple, tuple]] = []
+collecting = False
+
+
+def queue(button, visual_args: tuple, text_area: tuple, text: pygameextra.Text, bounds: Rect):
+    draw = (display.display_reference, visual_args, text_area, text)
+    if getattr(button, 'queued_frame', -1) != frame.index:
+        button.queued_frame = frame.index
+        button.queued_draws = []
+    elif draw in button.queued_draws:
+        # Only an exact repeat, like a redraw after a dirty region clear, is dropped
+        return
+    button.queued_draws.append(draw)
+    # Styles are grouped in the order they first show up, which stays the same between runs unlike their hashes
+    style = styles.setdefault(visual_args[5], len(styles))
+    commands.append(Command(display.display_reference, getattr(button, 'layer', 0), style, len(commands),
+                            button, visual_args, text_area, text, bounds))
+
+
+def flush_blits():
+    if blits:
+        display.display_reference.surface.blits(blits, doreturn=False)
+        blits.clear()
+
+
+def blit(surface: pygame.Surface, position: tuple, area: tuple = None, batched: bool = True):
+    # Only surfaces that stay untouched until the flush can wait, tinted scratch surfaces are reused right away
+    if collecting and batched:
+        blits.append((surface, position, area))
+        return
+    flush_blits()
+    display.display_reference.stamp(surface, position, area)
+
+
+def _render_text(command: Command):
+    if command.text:
+        command.text.rect.center = math.center(command.text_area)
+        blit(command.text.obj, command.text.rect.topleft)
+
+
+PHASES = (
+    lambda command: command.button.render_shadow_pass(command.visual_args),
+    lambda command: command.button.render_body_pass(command.visual_args),
+    _render_text,
+)
+
+
+def runs(queued: List[Command]) -> Iterator[List[Command]]:
+    # Commands in a run don't overlap, so drawing them pass by pass looks the same as drawing them one by one
+    cell_size = settings.cb_deferred_cell_size
+    run: List[Command] = []
+    cells: Dict[Tuple[int, int], List[pygame.Rect]] = {}
+    for command in queued:
+        # Plain rects, collidelist takes a much slower path for subclasses
+        bounds = pygame.Rect(command.bounds)
+        covered = [(x, y) for x in range(bounds.left // cell_size, (bounds.right - 1) // cell_size + 1)
+                   for y in range(bounds.top // cell_size, (bounds.bottom - 1) // cell_size + 1)]
+        if run and (command.target is not run[0].target or command.layer != run[0].layer or
+                    any(bounds.collidelist(cells.get(cell, ())) != -1 for cell in covered)):
+            yield run
+            run = []
+            cells = {}
+        run.append(command)
+        for cell in covered:
+            cells.setdefault(cell, []).append(bounds)
+    if run:
+        yield run
+
+
+def flush():
+    global collecting
+    if not commands:
+        return
+    # Stable, so buttons sharing a layer keep the order they were queued in
+    queued = sorted(commands, key=lambda command: command.layer)
+    previous = display.display_reference
+    collecting = True
+    try:
+        for run in runs(queued):
+            if display.display_reference is not run[0].target:
+                flush_blits()
+                display.context(run[0].target)
+            run.sort(key=lambda command: (command.style, command.order))
+            for phase in PHASES:
+                for command in run:
+                    phase(command)
+        flush_blits()
+    finally:
+        collecting = False
+        blits.clear()
+        commands.clear()
+        styles.clear()
+        display.context(previous)
+
+
+def update_wrapper(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if settings.cb_deferred:
+            flush()
+        return func(*args, **kwargs)
+
+    return wrapper
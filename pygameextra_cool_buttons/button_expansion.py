@@ -1,9 +1,11 @@
 from functools import lru_cache
 from typing import Union
 
-from pygameextra import draw
-from pygameextra.button import RectButton
+from pygameextra import Image
+from pygameextra.button import ImageButton, RectButton
+from pygameextra_cool_buttons import surfaces
 from pygameextra_cool_buttons.__base__ import WrappedButtonClassBase
+from pygameextra_cool_buttons.style import ButtonStyle
 
 
 class RectButtonExpansion(RectButton, WrappedButtonClassBase):
@@ -17,19 +19,28 @@ class RectButtonExpansion(RectButton, WrappedButtonClassBase):
     def get_w(cls, hovered: bool, disabled: bool, inactive_resource_width: int, active_resource_width: int):
         return active_resource_width if (hovered and not disabled) else inactive_resource_width
 
+    @classmethod
+    def get_style_w(cls, hovered: bool, disabled: bool, style: ButtonStyle):
+        # Only the width kwargs reach the cache, other extra kwargs may not be hashable
+        return cls.get_w(hovered, disabled, style.extra_kwargs.get('inactive_resource_width', 0),
+                         style.extra_kwargs.get('active_resource_width', 0))
+
     @classmethod
     def static_render_shadow(cls, area: tuple, hovered: bool = False, disabled: Union[bool, tuple] = None,
                              shadow_color: tuple = None, shadow_offset: tuple = None,
                              edge_rounding: int = -1, edge_rounding_topright: int = -1,
                              edge_rounding_topleft: int = -1, edge_rounding_bottomright: int = -1,
-                             edge_rounding_bottomleft: int = -1, **kwargs):
-        draw.rect(
-            shadow_color, cls.get_shadow_area(area, shadow_offset), cls.get_w(hovered, disabled, **kwargs),
-            edge_rounding=edge_rounding,
-            edge_rounding_topright=edge_rounding_topright,
-            edge_rounding_topleft=edge_rounding_topleft,
-            edge_rounding_bottomright=edge_rounding_bottomright,
-            edge_rounding_bottomleft=edge_rounding_bottomleft
+                             edge_rounding_bottomleft: int = -1, style: ButtonStyle = None, **kwargs):
+        if style is None:
+            style = ButtonStyle(shadow_color=shadow_color, shadow_offset=shadow_offset,
+                                edge_rounding=edge_rounding, edge_rounding_topright=edge_rounding_topright,
+                                edge_rounding_topleft=edge_rounding_topleft,
+                                edge_rounding_bottomright=edge_rounding_bottomright,
+                                edge_rounding_bottomleft=edge_rounding_bottomleft, extra_kwargs=kwargs)
+        surfaces.shadow(
+            shadow_color if shadow_color is not None else style.shadow_color,
+            cls.get_shadow_area(area, style.shadow_offset), cls.get_style_w(hovered, disabled, style),
+            style.shadow_blur or 0, style.shadow_spread or 0, *style.edge_roundings
         )
 
     @classmethod
@@ -39,20 +50,59 @@ class RectButtonExpansion(RectButton, WrappedButtonClassBase):
                       edge_rounding: int = -1,
                       edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
                       edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
-                      **kwargs
+                      style: ButtonStyle = None, **kwargs
                       ):
+        if style is None:
+            style = ButtonStyle(edge_rounding=edge_rounding, edge_rounding_topright=edge_rounding_topright,
+                                edge_rounding_topleft=edge_rounding_topleft,
+                                edge_rounding_bottomright=edge_rounding_bottomright,
+                                edge_rounding_bottomleft=edge_rounding_bottomleft, extra_kwargs=kwargs)
         color = active_resource if (hovered and not disabled) else (
             disabled if type(disabled) == tuple else inactive_resource)
-        draw.rect(
-            color, area, cls.get_w(hovered, disabled, **kwargs),
-            edge_rounding=edge_rounding,
-            edge_rounding_topright=edge_rounding_topright,
-            edge_rounding_topleft=edge_rounding_topleft,
-            edge_rounding_bottomright=edge_rounding_bottomright,
-            edge_rounding_bottomleft=edge_rounding_bottomleft,
+        surfaces.rect(color, area, cls.get_style_w(hovered, disabled, style), *style.edge_roundings)
+
+
+
+class ImageButtonExpansion(ImageButton, WrappedButtonClassBase):
+    __additional_attributes__ = {
+        'image_scale': None,
+    }
+
+    @classmethod
+    def static_render_shadow(cls, area: tuple, hovered: bool = False, disabled: Union[bool, Image] = None,
+                             shadow_color: tuple = None, shadow_offset: tuple = None,
+                             edge_rounding: int = -1, edge_rounding_topright: int = -1,
+                             edge_rounding_topleft: int = -1, edge_rounding_bottomright: int = -1,
+                             edge_rounding_bottomleft: int = -1, style: ButtonStyle = None, **kwargs):
+        if style is None:
+            style = ButtonStyle(shadow_color=shadow_color, shadow_offset=shadow_offset,
+                                edge_rounding=edge_rounding, edge_rounding_topright=edge_rounding_topright,
+                                edge_rounding_topleft=edge_rounding_topleft,
+                                edge_rounding_bottomright=edge_rounding_bottomright,
+                                edge_rounding_bottomleft=edge_rounding_bottomleft, extra_kwargs=kwargs)
+        surfaces.shadow(
+            shadow_color if shadow_color is not None else style.shadow_color,
+            cls.get_shadow_area(area, style.shadow_offset), 0,
+            style.shadow_blur or 0, style.shadow_spread or 0, *style.edge_roundings
         )
 
+    @classmethod
+    def static_render(cls, area: tuple, inactive_resource: Image = None, active_resource: Image = None,
+                      hovered: bool = False, disabled: Union[bool, Image] = None, shadow: bool = False,
+                      shadow_color: tuple = (0, 0, 0, 50), shadow_offset: tuple = (2, 2),
+                      edge_rounding: int = -1,
+                      edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+                      edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
+                      style: ButtonStyle = None, **kwargs
+                      ):
+        if style is None:
+            style = ButtonStyle(extra_kwargs=kwargs)
+        image = active_resource if (hovered and not disabled) else (
+            disabled if isinstance(disabled, Image) else inactive_resource)
+        surfaces.image(image.surface.surface, area, style.extra_kwargs.get('image_scale'))
+
 
 button_expansion_map = {
-    RectButton: RectButtonExpansion
+    RectButton: RectButtonExpansion,
+    ImageButton: ImageButtonExpansion,
 }
@@ -1,17 +1,23 @@
 import inspect
 import logging
+import sys
 from functools import lru_cache, wraps
 from types import FunctionType
-from typing import Type, Union
+from typing import Hashable, Type, Union
 
+import pygame
 import pygameextra
 import pygameextra.button as buttons
 import pygameextra.settings as settings
-from pygameextra import draw, mouse
+from pygameextra import mouse
 
+from pygameextra_cool_buttons import batch, dirty, frame, instrumentation, keys, spatial, surfaces, texts
 from pygameextra_cool_buttons.__base__ import WrappedButtonClassBase
+from pygameextra_cool_buttons.cache import FrameCache
 from pygameextra_cool_buttons.color import UniqueColor
-from pygameextra_cool_buttons.button_expansion import button_expansion_map
+from pygameextra_cool_buttons.style import DEFAULT_STYLE, ButtonStyle, overridden_styles, resolved_styles, \
+    track_settings, watch
+from pygameextra_cool_buttons.button_expansion import RectButtonExpansion, button_expansion_map
 
 original_action_function = buttons.action
 original_rect_function = buttons.rect
@@ -21,63 +27,105 @@ original_action_class = buttons.Button
 original_rect_class = buttons.RectButton
 original_image_class = buttons.ImageButton
 
+original_push_buttons = buttons.ButtonManager.push_buttons
+original_handle_buttons = buttons.ButtonManager.handle_buttons
+original_event_get = pygameextra.event.get
+original_display_update = pygameextra.display.update
+
+resolved_colors = FrameCache()
+
+
+def _style_property(name: str) -> property:
+    def getter(self):
+        return getattr(self.style, name)
+
+    def setter(self, value):
+        self.style = self.style.replace(**{name: value})
+
+    return property(getter, setter)
+
 
 class WrappedButtonClass(buttons.Button, WrappedButtonClassBase):
     __base_button__ = buttons.Button
 
-    def __init__(self, *args,
+    shadow = _style_property('shadow')
+    shadow_color = _style_property('shadow_color')
+    shadow_offset = _style_property('shadow_offset')
+    shadow_blur = _style_property('shadow_blur')
+    shadow_spread = _style_property('shadow_spread')
+    edge_rounding = _style_property('edge_rounding')
+    edge_rounding_topright = _style_property('edge_rounding_topright')
+    edge_rounding_topleft = _style_property('edge_rounding_topleft')
+    edge_rounding_bottomright = _style_property('edge_rounding_bottomright')
+    edge_rounding_bottomleft = _style_property('edge_rounding_bottomleft')
+    extra_kwargs = _style_property('extra_kwargs')
+
+    def __init__(self, *args, style: ButtonStyle = None,
                  shadow: bool = None, shadow_color: tuple = None, shadow_offset: tuple = None,
                  edge_rounding: int = -1,
                  edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
                  edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
-                 extra_kwargs: dict = {}, **kwargs):
+                 extra_kwargs: dict = {}, shadow_blur: int = None, shadow_spread: int = None, layer: int = 0,
+                 **kwargs):
         self.infos = {}
+        self.layer = layer
+        self.visual_state = None
+        self.visual_bounds = None
+        self.visual_text = None
+        self.style = (style or DEFAULT_STYLE).override(
+            shadow=shadow, shadow_color=shadow_color, shadow_offset=shadow_offset,
+            edge_rounding=edge_rounding,
+            edge_rounding_topright=edge_rounding_topright, edge_rounding_topleft=edge_rounding_topleft,
+            edge_rounding_bottomright=edge_rounding_bottomright, edge_rounding_bottomleft=edge_rounding_bottomleft,
+            extra_kwargs=extra_kwargs, shadow_blur=shadow_blur, shadow_spread=shadow_spread
+        )
         super().__init__(*args, **kwargs)
-        self.extra_kwargs = extra_kwargs
-        self.edge_rounding = edge_rounding
-        self.edge_rounding_topright = edge_rounding_topright
-        self.edge_rounding_topleft = edge_rounding_topleft
-        self.edge_rounding_bottomright = edge_rounding_bottomright
-        self.edge_rounding_bottomleft = edge_rounding_bottomleft
-        self.shadow = shadow
-        self.shadow_color = shadow_color
-        self.shadow_offset = shadow_offset
 
     def _color_translation(self, name: str, color: Union[bool, tuple, UniqueColor]):
-        if not isinstance(color, UniqueColor):
+        if type(color) is tuple or not isinstance(color, UniqueColor):
             return color
+        instrumentation.count('colors_resolved')
         info = self.infos.get(name)
         if info is None:
             self.infos[name] = (info := color.Info())
-        return color.get_color(info)
+        return resolved_colors.get((color, None if color.static else info), lambda: color.get_color(info))
+
+    def carry_over(self, previous_button: 'WrappedButtonClass'):
+        previous_button.carried_frame = frame.index
+        self.hovered = previous_button.hovered
+        self.infos = previous_button.infos
+        self.visual_state = previous_button.visual_state
+        self.visual_bounds = previous_button.visual_bounds
+
+    def _get_dynamic_area(self, style: ButtonStyle):
+        return self.get_shadow_area(self.area, style.shadow_offset) \
+            if style.shadow and self.hovered and \
+            (spatial.clicked() if settings.cb_spatial_hover else mouse.clicked())[0] else None
 
     @property
     def dynamic_area(self):
-        return self.get_shadow_area(self.area, self.shadow_offset or settings.cb_default_shadow_offset) \
-            if (self.shadow or settings.cb_default_shadow) and mouse.clicked()[0] and self.hovered else None
-
-    @staticmethod
-    def _edge_rounding_translation(name: str, edge_rounding: int):
-        if edge_rounding == -1:
-            return getattr(settings, f'cb_default_{name}')
-        return edge_rounding
+        return self._get_dynamic_area(self.style.resolved)
 
     @classmethod
     def static_render_shadow(cls, area: tuple, hovered: bool = False, disabled: Union[bool, tuple] = None,
                              shadow_color: tuple = None, shadow_offset: tuple = None,
                              edge_rounding: int = -1, edge_rounding_topright: int = -1,
                              edge_rounding_topleft: int = -1, edge_rounding_bottomright: int = -1,
-                             edge_rounding_bottomleft: int = -1):
-        draw.rect(
-            shadow_color, cls.get_shadow_area(area, shadow_offset), 0,
-            edge_rounding=edge_rounding,
-            edge_rounding_topright=edge_rounding_topright,
-            edge_rounding_topleft=edge_rounding_topleft,
-            edge_rounding_bottomright=edge_rounding_bottomright,
-            edge_rounding_bottomleft=edge_rounding_bottomleft
+                             edge_rounding_bottomleft: int = -1, style: ButtonStyle = None):
+        if style is None:
+            style = ButtonStyle(shadow_color=shadow_color, shadow_offset=shadow_offset,
+                                edge_rounding=edge_rounding, edge_rounding_topright=edge_rounding_topright,
+                                edge_rounding_topleft=edge_rounding_topleft,
+                                edge_rounding_bottomright=edge_rounding_bottomright,
+                                edge_rounding_bottomleft=edge_rounding_bottomleft)
+        surfaces.shadow(
+            shadow_color if shadow_color is not None else style.shadow_color,
+            cls.get_shadow_area(area, style.shadow_offset), 0, style.shadow_blur or 0, style.shadow_spread or 0,
+            *style.edge_roundings
         )
 
     @classmethod
+    @instrumentation.timed('static_render')
     def static_render(cls, area: tuple, inactive_resource=None, active_resource=None, hovered: bool = False,
                       disabled: Union[bool, tuple] = None, shadow: bool = None,
                       shadow_color: tuple = None, shadow_offset: tuple = None,
@@ -85,48 +133,48 @@ class WrappedButtonClass(buttons.Button, WrappedButtonClassBase):
                       edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
                       edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
                       extra_kwargs: dict = {},
-                      dynamic_area: tuple = None
+                      dynamic_area: tuple = None, style: ButtonStyle = None
                       ):
-        shadow = shadow if shadow is not None else settings.cb_default_shadow
-        shadow_color = shadow_color if shadow_color is not None else settings.cb_default_shadow_color
-        shadow_offset = shadow_offset if shadow_offset is not None else settings.cb_default_shadow_offset
-
-        edge_rounding = cls._edge_rounding_translation('edge_rounding', edge_rounding)
-        edge_rounding_topright = cls._edge_rounding_translation('edge_rounding_topright', edge_rounding_topright)
-        edge_rounding_topleft = cls._edge_rounding_translation('edge_rounding_topleft', edge_rounding_topleft)
-        edge_rounding_bottomright = cls._edge_rounding_translation('edge_rounding_bottomright',
-                                                                   edge_rounding_bottomright)
-        edge_rounding_bottomleft = cls._edge_rounding_translation('edge_rounding_bottomleft', edge_rounding_bottomleft)
-
-        if cls.__base_button__ in button_expansion_map:
-            if shadow:
-                button_expansion_map[cls.__base_button__].static_render_shadow(area, hovered, disabled, shadow_color,
-                                                                               shadow_offset,
-                                                                               edge_rounding, edge_rounding_topright,
-                                                                               edge_rounding_topleft,
-                                                                               edge_rounding_bottomright,
-                                                                               edge_rounding_bottomleft, **extra_kwargs)
-
-            button_expansion_map[cls.__base_button__].static_render(
-                dynamic_area or area, inactive_resource, active_resource,
-                hovered, disabled, shadow, shadow_color, shadow_offset, edge_rounding,
-                edge_rounding_topright, edge_rounding_topleft,
-                edge_rounding_bottomright, edge_rounding_bottomleft, **extra_kwargs
-            )
+        if style is None:
+            style = ButtonStyle(shadow, shadow_color, shadow_offset, edge_rounding,
+                                edge_rounding_topright, edge_rounding_topleft,
+                                edge_rounding_bottomright, edge_rounding_bottomleft, extra_kwargs)
+            shadow_color = None
+        style = style.resolved
+        shadow_color = shadow_color if shadow_color is not None else style.shadow_color
+        cls._static_render_shadow(area, hovered, disabled, shadow_color, style)
+        cls._static_render_body(dynamic_area or area, inactive_resource, active_resource, hovered, disabled,
+                                shadow_color, style)
+
+    @classmethod
+    def _static_render_shadow(cls, area: tuple, hovered: bool, disabled: Union[bool, tuple], shadow_color: tuple,
+                              style: ButtonStyle):
+        if not style.shadow:
+            return
+        instrumentation.count('shadows_drawn')
+        if (expansion := button_expansion_map.get(cls.__base_button__)) is not None:
+            expansion.static_render_shadow(area, hovered, disabled, shadow_color, style=style)
         else:
-            if shadow:
-                cls.static_render_shadow(area, hovered, disabled, shadow_color, shadow_offset,
-                                         edge_rounding, edge_rounding_topright, edge_rounding_topleft,
-                                         edge_rounding_bottomright, edge_rounding_bottomleft)
+            cls.static_render_shadow(area, hovered, disabled, shadow_color, style=style)
 
-            super().static_render(dynamic_area or area, inactive_resource, active_resource, hovered, disabled)
+    @classmethod
+    def _static_render_body(cls, area: tuple, inactive_resource, active_resource, hovered: bool,
+                            disabled: Union[bool, tuple], shadow_color: tuple, style: ButtonStyle):
+        if (expansion := button_expansion_map.get(cls.__base_button__)) is not None:
+            expansion.static_render(area, inactive_resource, active_resource,
+                                    hovered, disabled, shadow_color=shadow_color, style=style)
+        else:
+            batch.flush_blits()
+            super().static_render(area, inactive_resource, active_resource, hovered, disabled)
 
+    @instrumentation.timed('render')
     def render(self, area: tuple = None, inactive_resource=None, active_resource=None,
                text: pygameextra.Text = None, disabled: Union[bool, tuple, UniqueColor] = False, shadow: bool = None,
                shadow_color: tuple = None, shadow_offset: tuple = None,
                edge_rounding: int = -1,
                edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
-               edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1, extra_kwargs: dict = {}
+               edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1, extra_kwargs: dict = {},
+               style: ButtonStyle = None, shadow_blur: int = None, shadow_spread: int = None
                ):
         inactive_resource = self._color_translation('inactive_resource', inactive_resource)
         self_inactive_resource = self._color_translation('self_inactive_resource', self.inactive_resource)
@@ -135,23 +183,81 @@ class WrappedButtonClass(buttons.Button, WrappedButtonClassBase):
         disabled = self._color_translation('disabled', disabled)
         self_disabled = self._color_translation('self_disabled', self.disabled)
 
-        self_shadow_color = None
-
-        if (shadow or settings.cb_default_shadow) or self.shadow:
-            shadow_color = self._color_translation('shadow_color', shadow_color)
-            self_shadow_color = self._color_translation('self_shadow_color',
-                                                        self.shadow_color or settings.cb_default_shadow_color)
+        style = (style or self.style).override(
+            shadow=shadow, shadow_color=shadow_color, shadow_offset=shadow_offset,
+            edge_rounding=edge_rounding,
+            edge_rounding_topright=edge_rounding_topright, edge_rounding_topleft=edge_rounding_topleft,
+            edge_rounding_bottomright=edge_rounding_bottomright, edge_rounding_bottomleft=edge_rounding_bottomleft,
+            extra_kwargs=extra_kwargs, shadow_blur=shadow_blur, shadow_spread=shadow_spread
+        ).resolved
+        shadow_color = self._color_translation('shadow_color', style.shadow_color) if style.shadow else None
+
+        dynamic_area = self._get_dynamic_area(style)
+        text_area = area or dynamic_area or self.area
+        area = area or self.area
+        inactive_resource = inactive_resource or self_inactive_resource
+        active_resource = active_resource or self_active_resource
+        disabled = disabled or self_disabled
+        text = text or self.text
+
+        visual_args = (area, inactive_resource, active_resource, self.hovered, disabled, style, shadow_color,
+                       dynamic_area)
+        if settings.cb_dirty_tracking and not self._track_visual_state(visual_args, text_area, text):
+            instrumentation.count('buttons_skipped')
+            return
+
+        instrumentation.count('buttons_rendered')
+        if settings.cb_deferred:
+            batch.queue(self, visual_args, text_area, text, self.visual_bounds if settings.cb_dirty_tracking else
+                        self._get_visual_bounds(visual_args, text_area, text))
+            return
+        self._render_visual(visual_args)
+        self.static_render_text(text_area, text)
 
-        self.static_render(area or self.area, inactive_resource or self_inactive_resource,
-                           active_resource or self_active_resource, self.hovered, disabled or self_disabled,
-                           shadow or self.shadow, shadow_color or self_shadow_color,
-                           shadow_offset or self.shadow_offset,
-                           edge_rounding or self.edge_rounding, edge_rounding_topright or self.edge_rounding_topright,
-                           edge_rounding_topleft or self.edge_rounding_topleft,
-                           edge_rounding_bottomright or self.edge_rounding_bottomright,
-                           edge_rounding_bottomleft or self.edge_rounding_bottomleft, self.extra_kwargs,
-                           self.dynamic_area)
-        self.static_render_text(area or self.dynamic_area or self.area, text or self.text)
+    @classmethod
+    @instrumentation.timed('static_render_text')
+    def static_render_text(cls, area: tuple, text: pygameextra.Text):
+        super().static_render_text(area, text)
+
+    def _render_visual(self, visual_args: tuple):
+        area, inactive_resource, active_resource, hovered, disabled, style, shadow_color, dynamic_area = visual_args
+        self.static_render(area, inactive_resource, active_resource, hovered, disabled,
+                           shadow_color=shadow_color, dynamic_area=dynamic_area, style=style)
+
+    def render_shadow_pass(self, visual_args: tuple):
+        area, _, _, hovered, disabled, style, shadow_color, _ = visual_args
+        self._static_render_shadow(area, hovered, disabled,
+                                   shadow_color if shadow_color is not None else style.shadow_color, style)
+
+    def render_body_pass(self, visual_args: tuple):
+        area, inactive_resource, active_resource, hovered, disabled, style, shadow_color, dynamic_area = visual_args
+        self._static_render_body(dynamic_area or area, inactive_resource, active_resource, hovered, disabled,
+                                 shadow_color if shadow_color is not None else style.shadow_color, style)
+
+    def _track_visual_state(self, visual_args: tuple, text_area: tuple, text: pygameextra.Text) -> bool:
+        state = (visual_args, tuple(text_area),
+                 (text.text, text.font, text.color, text.background, text.antialias) if text else None)
+        self.visual_text = text
+        return dirty.track(self, state, pygameextra.Rect(*self._get_visual_bounds(visual_args, text_area, text)))
+
+    def _get_visual_bounds(self, visual_args: tuple, text_area: tuple, text: pygameextra.Text) -> pygame.Rect:
+        area, style = visual_args[0], visual_args[5]
+        bounds = pygame.Rect(area)
+        if style.shadow:
+            bounds.union_ip(surfaces.get_shadow_bounds(bounds.move(style.shadow_offset),
+                                                       style.shadow_blur, style.shadow_spread))
+        if text:
+            text_rect = text.rect.copy()
+            text_rect.center = pygame.Rect(text_area).center
+            bounds.union_ip(text_rect)
+        return bounds
+
+    def redraw_visual_state(self):
+        if settings.cb_deferred:
+            batch.queue(self, self.visual_state[0], self.visual_state[1], self.visual_text, self.visual_bounds)
+            return
+        self._render_visual(self.visual_state[0])
+        self.static_render_text(self.visual_state[1], self.visual_text)
 
 
 def button_class_wrapper(button_class: Type[buttons.Button]):
@@ -192,11 +298,13 @@ def add_extra_attributes_to_function(func: FunctionType, attributes: dict):
 def button_function_wrapper(cls):
     def wrapper(func):
         @wraps(func)
-        def wrapped(*args, shadow: bool = None, shadow_color: tuple = None, shadow_offset: tuple = None,
+        def wrapped(*args, style: ButtonStyle = None,
+                    shadow: bool = None, shadow_color: tuple = None, shadow_offset: tuple = None,
                     edge_rounding: int = -1,
                     edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
                     edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
-                    extra_kwargs: dict = {}, **kwargs):
+                    extra_kwargs: dict = {}, shadow_blur: int = None, shadow_spread: int = None,
+                    key: Hashable = None, layer: int = 0, **kwargs):
             func(*args, **kwargs)
             if not settings.game_context and not hasattr(settings, 'cb_warn_function_wrapper'):
                 logging.warning("Using the pygameextra button functions without a game context will not work properly")
@@ -205,15 +313,19 @@ def button_function_wrapper(cls):
             elif not settings.game_context:
                 return
             button = settings.game_context.buttons[-1]
-            button.shadow = shadow
-            button.shadow_color = shadow_color
-            button.shadow_offset = shadow_offset
-            button.edge_rounding = edge_rounding
-            button.edge_rounding_topright = edge_rounding_topright
-            button.edge_rounding_topleft = edge_rounding_topleft
-            button.edge_rounding_bottomright = edge_rounding_bottomright
-            button.edge_rounding_bottomleft = edge_rounding_bottomleft
-            button.extra_kwargs = extra_kwargs
+            button.style = (style or DEFAULT_STYLE).override(
+                shadow=shadow, shadow_color=shadow_color, shadow_offset=shadow_offset,
+                edge_rounding=edge_rounding,
+                edge_rounding_topright=edge_rounding_topright, edge_rounding_topleft=edge_rounding_topleft,
+                edge_rounding_bottomright=edge_rounding_bottomright,
+                edge_rounding_bottomleft=edge_rounding_bottomleft,
+                extra_kwargs=extra_kwargs, shadow_blur=shadow_blur, shadow_spread=shadow_spread
+            )
+            call_site = sys._getframe(1)
+            while call_site.f_globals.get('__name__') == __name__:
+                call_site = call_site.f_back
+            keys.register(button, key if key is not None else button.name, (call_site.f_code, call_site.f_lineno))
+            button.layer = layer
             setattr(button, 'cool_button', True)
             buttons.check_hover(button)
 
@@ -237,9 +349,15 @@ def expanded_button_check(button: WrappedButtonClass):
     elif not isinstance(button, WrappedButtonClass):
         return
 
-    if len(settings.game_context.previous_buttons) >= (buttons_length := len(settings.game_context.buttons)):
-        button.hovered = settings.game_context.previous_buttons[buttons_length - 1].hovered
-        button.infos = settings.game_context.previous_buttons[buttons_length - 1].infos
+    if hasattr(button, 'cb_key'):
+        if (previous_button := keys.previous(button)) is not None:
+            button.carry_over(previous_button)
+        else:
+            button.hovered = False
+        button.render()
+        button.hovered = False
+    elif len(settings.game_context.previous_buttons) >= (buttons_length := len(settings.game_context.buttons)):
+        button.carry_over(settings.game_context.previous_buttons[buttons_length - 1])
         button.render()
         button.hovered = False
     else:
@@ -250,6 +368,8 @@ def expanded_button_check(button: WrappedButtonClass):
 # Wrap pygameextra buttons with extended functionality
 
 if not hasattr(settings, 'cool_buttons'):
+    track_settings()
+
     buttons.check_hover = expanded_button_check
 
     buttons.Button = button_class_wrapper(original_action_class)
@@ -260,6 +380,30 @@ if not hasattr(settings, 'cool_buttons'):
     buttons.rect = button_function_wrapper(original_rect_class)(original_rect_function)
     buttons.image = button_function_wrapper(original_image_class)(original_image_function)
 
+    buttons.ButtonManager.push_buttons = frame.push_buttons_wrapper(original_push_buttons)
+    buttons.ButtonManager.handle_buttons = spatial.handle_buttons_wrapper(original_handle_buttons)
+    pygameextra.event.get = spatial.event_get_wrapper(original_event_get)
+    # Vanished buttons are cleared before the deferred flush, which then draws whatever they uncovered
+    pygameextra.display.update = dirty.update_wrapper(batch.update_wrapper(original_display_update))
+    instrumentation.register_cache('resolved_colors', resolved_colors)
+    instrumentation.register_cache('surfaces', surfaces.baked_surfaces)
+    instrumentation.register_cache('masks', surfaces.masks)
+    instrumentation.register_cache('shadows', surfaces.shadows)
+    instrumentation.register_cache('gradients', surfaces.gradients)
+    instrumentation.register_cache('texts', texts.cached_texts)
+    instrumentation.register_cache('images', surfaces.scaled_images)
+    instrumentation.register_cache('atlas', surfaces.atlas)
+    instrumentation.register_cache('styles', resolved_styles)
+    instrumentation.register_cache('style_overrides', overridden_styles)
+    instrumentation.register_cache('shadow_area', WrappedButtonClass.get_shadow_area.__func__)
+    instrumentation.register_cache('expansion_w', RectButtonExpansion.get_w.__func__)
+    instrumentation.register_timed(WrappedButtonClass)
+    watch('cb_instrumentation_timing', instrumentation.set_timing)
+    frame.tick_callbacks.append(instrumentation.tick)
+    frame.tick_callbacks.append(resolved_colors.tick)
+    frame.tick_callbacks.append(dirty.tick)
+    frame.tick_callbacks.append(keys.tick)
+
     setattr(settings, 'cool_buttons', True)
     setattr(settings, 'cb_default_edge_rounding', -1)
     setattr(settings, 'cb_default_edge_rounding_topright', -1)
@@ -269,3 +413,26 @@ if not hasattr(settings, 'cool_buttons'):
     setattr(settings, 'cb_default_shadow', False)
     setattr(settings, 'cb_default_shadow_color', (0, 0, 0, 50))
     setattr(settings, 'cb_default_shadow_offset', (2, 2))
+    setattr(settings, 'cb_default_shadow_blur', 0)
+    setattr(settings, 'cb_default_shadow_spread', 0)
+    setattr(settings, 'cb_surface_cache', False)
+    setattr(settings, 'cb_surface_cache_size', 512)
+    setattr(settings, 'cb_mask_cache', False)
+    setattr(settings, 'cb_mask_cache_size', 128)
+    setattr(settings, 'cb_shadow_cache_size', 64)
+    setattr(settings, 'cb_gradient_cache_size', 64)
+    setattr(settings, 'cb_text_cache_bytes', 8 * 1024 * 1024)
+    setattr(settings, 'cb_image_cache_size', 128)
+    setattr(settings, 'cb_atlas', False)
+    setattr(settings, 'cb_atlas_size', 1024)
+    setattr(settings, 'cb_atlas_pages', 4)
+    setattr(settings, 'cb_deferred', False)
+    setattr(settings, 'cb_deferred_cell_size', 256)
+    setattr(settings, 'cb_dirty_tracking', False)
+    setattr(settings, 'cb_dirty_background', None)
+    setattr(settings, 'cb_spatial_hover', False)
+    setattr(settings, 'cb_spatial_cell_size', 64)
+    setattr(settings, 'cb_style_cache_size', 256)
+    setattr(settings, 'cb_instrumentation', False)
+    setattr(settings, 'cb_instrumentation_timing', False)
+    setattr(settings, 'cb_instrumentation_history', 300)
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import pygameextra.settings as settings
+
+
+class LRUCache:
+    def __init__(self, size_setting: str):
+        self.size_setting = size_setting
+        self.items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return getattr(settings, self.size_setting)
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            value = self.items[key] = factory()
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+            return value
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    def clear(self):
+        self.items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key: Hashable):
+        return key in self.items
+
+
+class SizedLRUCache(LRUCache):
+    def __init__(self, size_setting: str, sizeof: Callable[[Any], int]):
+        super().__init__(size_setting)
+        self.sizeof = sizeof
+        self.sizes: dict = {}
+        self.bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            value = self.items[key] = factory()
+            self.sizes[key] = size = self.sizeof(value)
+            self.bytes += size
+            # The size setting is a byte budget here, an entry larger than the whole budget isn't kept
+            while self.bytes > self.max_size:
+                evicted_key, _ = self.items.popitem(last=False)
+                evicted_size = self.sizes.pop(evicted_key)
+                self.bytes -= evicted_size
+                self.evictions += 1
+                self.evicted_bytes += evicted_size
+            return value
+        self.hits += 1
+        self.items.move_to_end(key)
+        return value
+
+    def clear(self):
+        super().clear()
+        self.sizes.clear()
+        self.bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+
+class FrameCache:
+    def __init__(self):
+        self.items: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        try:
+            value = self.items[key]
+        except KeyError:
+            self.misses += 1
+            value = self.items[key] = factory()
+            return value
+        self.hits += 1
+        return value
+
+    def tick(self):
+        self.items.clear()
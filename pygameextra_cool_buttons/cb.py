@@ -1,4 +1,5 @@
 import pygameextra_cool_buttons.buttons as cool_buttons
+import pygameextra_cool_buttons.retained as retained
 
 # Original pygameextra buttons with wrappers
 action = cool_buttons.buttons.action
@@ -8,4 +9,5 @@ Button = cool_buttons.buttons.Button
 RectButton = cool_buttons.buttons.RectButton
 ImageButton = cool_buttons.buttons.ImageButton
 
-
+# Buttons that persist across frames
+RetainedButton = retained.RetainedButton
@@ -1,10 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from bisect import bisect_right
+from numbers import Number
+from typing import Dict, Hashable, List, Sequence, Tuple, Union
 
+import numpy
 from pygameextra import settings
 
+from pygameextra_cool_buttons import frame
+
+
+def _rgba(color: tuple) -> tuple:
+    return (*color[:3], color[3] if len(color) > 3 else 255)
+
+
+def _is_percentages(infos_or_percentages: Sequence) -> bool:
+    return isinstance(infos_or_percentages, numpy.ndarray) or \
+        (len(infos_or_percentages) > 0 and isinstance(infos_or_percentages[0], Number))
+
 
 class UniqueColor(ABC):
+    static: bool = False
+
     class Info(ABC):
         pass
 
@@ -12,6 +28,12 @@ class UniqueColor(ABC):
     def get_color(self, info: Info) -> tuple:
         raise NotImplementedError("Method get_next_color not implemented")
 
+    def get_colors(self, infos_or_percentages: Sequence[Union[Info, float]]) -> numpy.ndarray:
+        if _is_percentages(infos_or_percentages):
+            raise TypeError(f"{type(self).__name__} can only be evaluated in batch from infos")
+        return numpy.array([_rgba(self.get_color(info)) for info in infos_or_percentages],
+                           dtype=numpy.uint8).reshape(-1, 4)
+
 
 class ColorWithPercentageMixin:
     class Info:
@@ -24,6 +46,7 @@ class ColorWithPercentage(UniqueColor, ColorWithPercentageMixin, ABC):
 
 
 class Color(UniqueColor):
+    static = True
 
     def __init__(self, color: tuple):
         self.color = color
@@ -31,6 +54,9 @@ class Color(UniqueColor):
     def get_color(self, info) -> tuple:
         return self.color
 
+    def get_colors(self, infos_or_percentages: Sequence[Union[UniqueColor.Info, float]]) -> numpy.ndarray:
+        return numpy.tile(numpy.array(_rgba(self.color), dtype=numpy.uint8), (len(infos_or_percentages), 1))
+
 
 class PartialGradientColor:
     def __init__(self, color: UniqueColor, percentage: float):
@@ -45,27 +71,143 @@ class GradientColor(ColorWithPercentage):
             self.sub_infos = None
 
 
-    def __init__(self, *colors: PartialGradientColor):
+    def __init__(self, *colors: PartialGradientColor, resolution: int = 256):
+        if resolution < 2:
+            raise ValueError("Gradient resolution should be at least 2")
         self.colors: Tuple[PartialGradientColor, ...] = tuple(sorted(colors, key=lambda x: x.percentage))
+        self.stops: List[float] = [color.percentage for color in self.colors]
+        self.resolution = resolution
+        self.dynamic_stops = not all(color.color.static for color in self.colors)
+        self._stop_colors = None if self.dynamic_stops else tuple(
+            color.color.get_color(color.color.Info()) for color in self.colors)
+        self._table = [None] * resolution
+        self._array_table = None
+        self._batch_info = None
 
     @staticmethod
     def _interpolate(color1: tuple, color2: tuple, percentage: float) -> tuple:
         return tuple(int(color1[i] * (1 - percentage) + color2[i] * percentage) for i in range(3))
 
+    def _compute_color_at(self, percentage: float) -> tuple:
+        if len(self.stops) == 1 or percentage < self.stops[0]:
+            return self._interpolate(self._stop_colors[0], self._stop_colors[0], 0)
+        i = min(bisect_right(self.stops, percentage) - 1, len(self.stops) - 2)
+        span = self.stops[i + 1] - self.stops[i]
+        return self._interpolate(self._stop_colors[i], self._stop_colors[i + 1],
+                                 min(max((percentage - self.stops[i]) / span, 0), 1) if span else 1)
+
     def get_color_at(self, percentage: float, info: Info) -> tuple:
         if percentage < 0 or percentage > 1:
             raise ValueError("Percentage should be between 0 and 1")
-        for i in range(len(self.colors) - 1):
-            if self.colors[i].percentage <= percentage <= self.colors[i + 1].percentage:
-                return self._interpolate(self.colors[i].color.get_color(info.sub_infos[i]), self.colors[i + 1].color.get_color(info.sub_infos[i + 1]),
-                                         (percentage - self.colors[i].percentage) / (
-                                                 self.colors[i + 1].percentage - self.colors[i].percentage))
+        if self.dynamic_stops:
+            stop_colors = tuple(color.color.get_color(sub_info) for color, sub_info in zip(self.colors, info.sub_infos))
+            if stop_colors != self._stop_colors:
+                self._stop_colors = stop_colors
+                self._table = [None] * self.resolution
+        index = int(percentage * (self.resolution - 1) + .5)
+        if (color := self._table[index]) is None:
+            color = self._table[index] = self._compute_color_at(index / (self.resolution - 1))
+        return color
 
     def get_color(self, info: Info) -> tuple:
         if info.sub_infos is None:
             info.sub_infos = [color.color.Info() for color in self.colors]
         return self.get_color_at(info.percentage, info)
 
+    def _compute_colors_at(self, percentages: numpy.ndarray) -> numpy.ndarray:
+        stops = numpy.array(self.stops, dtype=numpy.float64)
+        stop_colors = numpy.array([stop_color[:3] for stop_color in self._stop_colors], dtype=numpy.float64)
+        colors = numpy.full((len(percentages), 4), 255, dtype=numpy.uint8)
+        if len(stops) == 1:
+            colors[:, :3] = stop_colors[0].astype(numpy.uint8)
+            return colors
+        i = numpy.minimum(numpy.searchsorted(stops, percentages, side='right') - 1, len(stops) - 2)
+        i = numpy.maximum(i, 0)
+        span = stops[i + 1] - stops[i]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            t = numpy.where(span > 0, numpy.clip((percentages - stops[i]) / span, 0, 1), 1)
+        t = numpy.where(percentages < stops[0], 0, t)[:, None]
+        colors[:, :3] = (stop_colors[i] * (1 - t) + stop_colors[i + 1] * t).astype(numpy.uint8)
+        return colors
+
+    def get_colors(self, infos_or_percentages: Sequence[Union[Info, float]]) -> numpy.ndarray:
+        if _is_percentages(infos_or_percentages):
+            percentages = numpy.asarray(infos_or_percentages, dtype=numpy.float64)
+        elif self.dynamic_stops:
+            return super().get_colors(infos_or_percentages)
+        else:
+            percentages = numpy.fromiter((info.percentage for info in infos_or_percentages), dtype=numpy.float64,
+                                         count=len(infos_or_percentages))
+        if numpy.any((percentages < 0) | (percentages > 1)):
+            raise ValueError("Percentage should be between 0 and 1")
+        indexes = (percentages * (self.resolution - 1) + .5).astype(numpy.intp)
+        if self.dynamic_stops:
+            if self._batch_info is None:
+                self._batch_info = self.Info()
+                self._batch_info.sub_infos = [color.color.Info() for color in self.colors]
+            stop_colors = tuple(color.color.get_color(sub_info)
+                                for color, sub_info in zip(self.colors, self._batch_info.sub_infos))
+            if stop_colors != self._stop_colors:
+                self._stop_colors = stop_colors
+                self._table = [None] * self.resolution
+            return self._compute_colors_at(indexes / (self.resolution - 1))
+        if self._array_table is None:
+            self._array_table = self._compute_colors_at(numpy.arange(self.resolution) / (self.resolution - 1))
+        return self._array_table[indexes]
+
+
+class GradientFill:
+    LINEAR = 'linear'
+    RADIAL = 'radial'
+
+    def __init__(self, gradient: GradientColor, mode: str = LINEAR, angle: float = 0,
+                 center: Tuple[float, float] = (.5, .5)):
+        if mode not in (self.LINEAR, self.RADIAL):
+            raise ValueError(f"Unknown gradient fill mode {mode!r}")
+        self.gradient = gradient
+        self.mode = mode
+        self.angle = angle
+        self.center = center
+
+    def get_percentages(self, size: Tuple[int, int]) -> numpy.ndarray:
+        width, height = size
+        # Indexed (x, y) like pygame.surfarray, sampled at pixel centers
+        x, y = numpy.meshgrid(numpy.arange(width) + .5 - width * self.center[0],
+                              numpy.arange(height) + .5 - height * self.center[1], indexing='ij')
+        if self.mode == self.RADIAL:
+            percentages = numpy.hypot(x / max(width / 2, 1), y / max(height / 2, 1))
+        else:
+            angle = numpy.radians(self.angle)
+            dx, dy = numpy.cos(angle), numpy.sin(angle)
+            extent = abs(width * dx) + abs(height * dy)
+            percentages = (x * dx + y * dy) / extent + .5 if extent else numpy.zeros_like(x)
+        return numpy.clip(percentages, 0, 1)
+
+    def get_colors(self, size: Tuple[int, int]) -> numpy.ndarray:
+        percentages = self.get_percentages(size)
+        return self.gradient.get_colors(percentages.ravel()).reshape(*percentages.shape, 4)
+
+
+class Timeline:
+    timelines: Dict[Hashable, 'Timeline'] = {}
+
+    def __init__(self, name: Hashable = None):
+        self.name = name
+        self.start = frame.time
+
+    @classmethod
+    def get(cls, name: Hashable = None) -> 'Timeline':
+        if (timeline := cls.timelines.get(name)) is None:
+            cls.timelines[name] = timeline = cls(name)
+        return timeline
+
+    @property
+    def time(self) -> float:
+        return frame.time - self.start
+
+    def reset(self):
+        self.start = frame.time
+
 
 class PulsingColor(ColorWithPercentageMixin, UniqueColor):
     class Info(ColorWithPercentageMixin.Info):
@@ -74,7 +216,8 @@ class PulsingColor(ColorWithPercentageMixin, UniqueColor):
             self.pulse_state = 0
             self.time = 0
 
-    def __init__(self, color: ColorWithPercentage, pulse_in: float, pulse_hold: float, pulse_out: float):
+    def __init__(self, color: ColorWithPercentage, pulse_in: float, pulse_hold: float, pulse_out: float,
+                 timeline: Union[bool, Hashable, Timeline] = None):
         self.color = color
 
         class CombinedInfo(color.Info, self.Info):
@@ -83,12 +226,41 @@ class PulsingColor(ColorWithPercentageMixin, UniqueColor):
         self.pulse_in = pulse_in
         self.pulse_hold = pulse_hold
         self.pulse_out = pulse_out
+        if timeline is None or timeline is False:
+            self.timeline = None
+        elif isinstance(timeline, Timeline):
+            self.timeline = timeline
+        else:
+            self.timeline = Timeline.get(None if timeline is True else timeline)
+        self._shared_info = None
+        self._shared_frame = -1
+        self._shared_color = None
 
-    def get_color(self, info: Info) -> tuple:
-        try:
-            info.time += settings.game_context.delta_time
-        except AttributeError:
-            raise AttributeError("PulsingColor can only be used in a game context")
+    @property
+    def period(self) -> float:
+        return self.pulse_in + self.pulse_hold + self.pulse_out
+
+    def seek(self, info: Info, t: float):
+        t = t % self.period if self.period > 0 else 0
+        if t < self.pulse_in:
+            info.pulse_state, info.time, info.percentage = 0, t, t / self.pulse_in
+        elif (t := t - self.pulse_in) < self.pulse_hold:
+            info.pulse_state, info.time, info.percentage = 1, t, 1
+        else:
+            t -= self.pulse_hold
+            info.pulse_state, info.time, info.percentage = 2, t, 1 - t / self.pulse_out if self.pulse_out else 0
+
+    def get_color_at_time(self, t: float, info: Info = None) -> tuple:
+        self.seek(info := info or self.Info(), t)
+        return self.color.get_color(info)
+
+    def _advance(self, info: Info, delta_time: float = None):
+        if delta_time is None:
+            try:
+                delta_time = settings.game_context.delta_time
+            except AttributeError:
+                raise AttributeError("PulsingColor can only be used in a game context")
+        info.time += delta_time
 
         if info.pulse_state == 0:
             if info.time >= self.pulse_in:
@@ -108,4 +280,92 @@ class PulsingColor(ColorWithPercentageMixin, UniqueColor):
                 info.pulse_state = 0
             else:
                 info.percentage = 1 - info.time / self.pulse_out
+
+    def _get_shared_color(self) -> tuple:
+        if self._shared_frame != frame.index:
+            if self._shared_info is None:
+                self._shared_info = self.Info()
+            self._shared_frame = frame.index
+            self._shared_color = self.get_color_at_time(self.timeline.time, self._shared_info)
+        return self._shared_color
+
+    def get_color(self, info: Info) -> tuple:
+        if self.timeline is not None:
+            return self._get_shared_color()
+        self._advance(info)
         return self.color.get_color(info)
+
+    def get_colors(self, infos_or_percentages: Sequence[Union[Info, float]]) -> numpy.ndarray:
+        if self.timeline is not None and not _is_percentages(infos_or_percentages):
+            return numpy.tile(numpy.array(_rgba(self._get_shared_color()), dtype=numpy.uint8),
+                              (len(infos_or_percentages), 1))
+        elif not _is_percentages(infos_or_percentages):
+            for info in infos_or_percentages:
+                self._advance(info)
+        return self.color.get_colors(infos_or_percentages)
+
+    def compile(self, fps: float = 60) -> UniqueColor:
+        # Only a pulse over fixed stops repeats exactly, anything else stays live. The table matches the live
+        # color frame for frame only while the game runs at the fps it was compiled for
+        if self.period <= 0 or getattr(self.color, 'dynamic_stops', False):
+            return self
+        return CompiledPulsingColor(self, fps)
+
+
+class CompiledPulsingColor(UniqueColor):
+    class Info:
+        def __init__(self):
+            self.position = 0
+
+    def __init__(self, source: PulsingColor, fps: float = 60):
+        self.source = source
+        self.color = source.color
+        self.timeline = source.timeline
+        self.period = source.period
+        self.fps = fps
+        # Timelines seek the exact phase, so their table samples the period at the target fps and looks up the
+        # nearest sample, off by at most half a frame when the period isn't a whole number of frames
+        self.length = int(self.period * fps + .5) + 1
+        info = source.Info()
+        self.colors: List[tuple] = [source.get_color_at_time(i / fps, info) for i in range(self.length)]
+        self.table = numpy.array([_rgba(color) for color in self.colors], dtype=numpy.uint8)
+        # Per-button pulses step the live state machine at the target fps, so the overshoot it drops at every
+        # phase change is dropped here too and the cycle can be a few frames longer than the period
+        info = source.Info()
+        self.step_colors: List[tuple] = [source.color.get_color(info)]
+        while True:
+            source._advance(info, 1 / fps)
+            if info.pulse_state == 0 and info.time == 0:
+                break
+            self.step_colors.append(source.color.get_color(info))
+        self.steps = len(self.step_colors)
+        self.step_table = numpy.array([_rgba(color) for color in self.step_colors], dtype=numpy.uint8)
+
+    def _index(self, t: float) -> int:
+        return min(int(t % self.period * self.fps + .5), self.length - 1)
+
+    def get_color_at_time(self, t: float, info: Info = None) -> tuple:
+        return self.colors[self._index(t)]
+
+    def _advance(self, info: Info):
+        try:
+            info.position = (info.position + settings.game_context.delta_time * self.fps) % self.steps
+        except AttributeError:
+            raise AttributeError("PulsingColor can only be used in a game context")
+
+    def get_color(self, info: Info) -> tuple:
+        if self.timeline is not None:
+            return self.colors[self._index(self.timeline.time)]
+        self._advance(info)
+        return self.step_colors[int(info.position + 1e-6) % self.steps]
+
+    def get_colors(self, infos_or_percentages: Sequence[Union[Info, float]]) -> numpy.ndarray:
+        if _is_percentages(infos_or_percentages):
+            return self.color.get_colors(infos_or_percentages)
+        if self.timeline is not None:
+            return numpy.tile(self.table[self._index(self.timeline.time)], (len(infos_or_percentages), 1))
+        for info in infos_or_percentages:
+            self._advance(info)
+        positions = numpy.fromiter((info.position for info in infos_or_percentages), dtype=numpy.float64,
+                                   count=len(infos_or_percentages))
+        return self.step_table[(positions + 1e-6).astype(numpy.intp) % self.steps]
@@ -0,0 +1,76 @@
+from functools import wraps
+from typing import List
+
+import pygameextra.settings as settings
+from pygameextra import display, draw
+from pygameextra.rect import Rect
+
+from pygameextra_cool_buttons import frame
+
+rects: List[Rect] = []
+tracked: list = []
+
+
+def clear_region(rect: Rect):
+    surface = display.display_reference.surface
+    clip = surface.get_clip()
+    surface.set_clip(rect.clip(clip))
+    draw.rect(settings.cb_dirty_background, rect)
+    for button in tracked:
+        if button.visual_bounds.colliderect(rect):
+            button.redraw_visual_state()
+    surface.set_clip(clip)
+
+
+def track(button, state: tuple, bounds: Rect) -> bool:
+    previous_bounds = button.visual_bounds
+    changed = state != button.visual_state or previous_bounds is None or \
+        (rects and bounds.collidelist(rects) != -1)
+    button.visual_state = state
+    button.visual_bounds = bounds
+    if changed:
+        rect = bounds.union(previous_bounds) if previous_bounds is not None else bounds
+        rects.append(rect)
+        if settings.cb_dirty_background is not None:
+            clear_region(rect)
+    tracked.append(button)
+    return changed or settings.cb_dirty_background is None
+
+
+def find_vanished() -> List[Rect]:
+    vanished = []
+    if settings.game_context:
+        for button in settings.game_context.previous_buttons:
+            if (bounds := getattr(button, 'visual_bounds', None)) is None or \
+                    getattr(button, 'carried_frame', -1) == frame.index:
+                continue
+            vanished.append(bounds)
+    return vanished
+
+
+def clear_vanished():
+    if settings.cb_dirty_background is None:
+        return
+    for bounds in find_vanished():
+        clear_region(bounds)
+
+
+def collect_dirty_rects() -> List[Rect]:
+    return rects + find_vanished()
+
+
+def update_wrapper(func):
+    # Buttons that weren't drawn this frame are cleared before the display is updated, whether the dirty rects
+    # are collected or not
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if settings.cb_dirty_tracking:
+            clear_vanished()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def tick():
+    rects.clear()
+    tracked.clear()
@@ -0,0 +1,26 @@
+from functools import wraps
+from typing import Callable, List
+
+import pygameextra.settings as settings
+
+index = 0
+time = 0.0
+tick_callbacks: List[Callable[[], None]] = []
+
+
+def tick():
+    global index, time
+    index += 1
+    time += settings.game_context.delta_time
+    for callback in tick_callbacks:
+        callback()
+
+
+def push_buttons_wrapper(func):
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        func(self, *args, **kwargs)
+        if settings.game_context and getattr(settings.game_context, 'button_manager', None) is self:
+            tick()
+
+    return wrapper
@@ -0,0 +1,152 @@
+from collections import Counter, deque
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, Hashable, List, NamedTuple, Tuple
+
+import pygameextra.settings as settings
+
+from pygameextra_cool_buttons import frame
+
+
+class ButtonTiming(NamedTuple):
+    key: Hashable
+    style: Any
+    phase: str
+    seconds: float
+
+
+class FrameStats(NamedTuple):
+    index: int
+    counters: Dict[str, int]
+    caches: Dict[str, Tuple[int, int]]
+    timings: List[ButtonTiming]
+
+
+counters: Counter = Counter()
+timings: List[ButtonTiming] = []
+caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+cache_totals: Dict[str, Tuple[int, int]] = {}
+history: Deque[FrameStats] = deque()
+hooks: List[Callable[[FrameStats], None]] = []
+timed_methods: List[Tuple[type, str, Any, Any]] = []
+current_button = None
+
+
+def count(name: str, amount: int = 1):
+    if settings.cb_instrumentation:
+        counters[name] += amount
+
+
+def register_cache(name: str, cache: Any):
+    if hasattr(cache, 'cache_info'):
+        caches[name] = lambda: tuple(cache.cache_info()[:2])
+    else:
+        caches[name] = lambda: (cache.hits, cache.misses)
+    cache_totals[name] = caches[name]()
+
+
+def _button_key(button: Any) -> Hashable:
+    if isinstance(button, type):
+        return button.__name__
+    if (key := getattr(button, 'cb_key', None)) is not None:
+        return key
+    return getattr(button, 'name', None) or type(button).__name__
+
+
+def timed(phase: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(owner, *args, **kwargs):
+            global current_button
+            previous_button = current_button
+            if not isinstance(owner, type):
+                current_button = owner
+            button = current_button if current_button is not None else owner
+            start = perf_counter()
+            try:
+                return func(owner, *args, **kwargs)
+            finally:
+                timings.append(ButtonTiming(_button_key(button), getattr(button, 'style', None)
+                                            if not isinstance(button, type) else None,
+                                            phase, perf_counter() - start))
+                current_button = previous_button
+
+        # The timed wrapper is only swapped in while timing is on, so the untimed path costs nothing
+        func.cb_timed = wrapper
+        return func
+
+    return decorator
+
+
+def register_timed(cls: type):
+    for name, attribute in vars(cls).items():
+        if (wrapper := getattr(getattr(attribute, '__func__', attribute), 'cb_timed', None)) is None:
+            continue
+        timed_methods.append((cls, name, attribute,
+                              classmethod(wrapper) if isinstance(attribute, classmethod) else wrapper))
+    set_timing(getattr(settings, 'cb_instrumentation_timing', False))
+
+
+def set_timing(enabled: bool):
+    for owner, name, untimed, timed_method in timed_methods:
+        setattr(owner, name, timed_method if enabled else untimed)
+
+
+def tick():
+    cache_stats = {}
+    for name, info in caches.items():
+        hits, misses = info()
+        previous_hits, previous_misses = cache_totals[name]
+        cache_totals[name] = (hits, misses)
+        # A cleared cache restarts its totals from zero
+        cache_stats[name] = (hits - previous_hits if hits >= previous_hits else hits,
+                             misses - previous_misses if misses >= previous_misses else misses)
+    if settings.cb_instrumentation:
+        stats = FrameStats(frame.index - 1, dict(counters), cache_stats, timings.copy())
+        history.append(stats)
+        while len(history) > settings.cb_instrumentation_history:
+            history.popleft()
+        for hook in hooks:
+            hook(stats)
+    counters.clear()
+    timings.clear()
+
+
+def reset():
+    history.clear()
+
+
+def _timing_summary(groups: Dict[Hashable, List[float]], top: int) -> List[Dict[str, Any]]:
+    rows = [{'key': key[0], 'phase': key[1], 'calls': len(seconds), 'total': sum(seconds),
+             'mean': sum(seconds) / len(seconds)} for key, seconds in groups.items()]
+    return sorted(rows, key=lambda row: row['total'], reverse=True)[:top]
+
+
+def summary(top: int = 10) -> Dict[str, Any]:
+    frames = len(history)
+    totals: Counter = Counter()
+    cache_hits: Counter = Counter()
+    cache_misses: Counter = Counter()
+    buttons: Dict[Hashable, List[float]] = {}
+    styles: Dict[Hashable, List[float]] = {}
+    for stats in history:
+        totals.update(stats.counters)
+        for name, (hits, misses) in stats.caches.items():
+            cache_hits[name] += hits
+            cache_misses[name] += misses
+        for timing in stats.timings:
+            buttons.setdefault((timing.key, timing.phase), []).append(timing.seconds)
+            styles.setdefault((timing.style, timing.phase), []).append(timing.seconds)
+    return {
+        'frames': frames,
+        'counters': {name: total / frames for name, total in totals.items()} if frames else {},
+        'caches': {
+            name: {
+                'hits': cache_hits[name], 'misses': cache_misses[name],
+                'hit_rate': cache_hits[name] / (cache_hits[name] + cache_misses[name])
+                if cache_hits[name] + cache_misses[name] else None
+            } for name in caches
+        },
+        'buttons': _timing_summary(buttons, top),
+        'styles': _timing_summary(styles, top),
+    }
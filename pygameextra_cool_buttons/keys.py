@@ -0,0 +1,45 @@
+from typing import Any, Dict, Hashable, Optional
+
+buttons_with_keys: Dict[Hashable, Any] = {}
+previous_buttons_with_keys: Dict[Hashable, Any] = {}
+buttons_with_site_keys: Dict[Hashable, Any] = {}
+previous_buttons_with_site_keys: Dict[Hashable, Any] = {}
+call_site_counts: Dict[Hashable, int] = {}
+
+
+def register(button, key: Hashable = None, call_site: Hashable = None) -> Hashable:
+    if key is None:
+        key = (call_site, tuple(button.area))
+        button.cb_site_key = (call_site, call_site_counts.get(call_site, 0))
+        call_site_counts[call_site] = button.cb_site_key[1] + 1
+        buttons_with_site_keys[button.cb_site_key] = button
+    if key in buttons_with_keys and buttons_with_keys[key] is not button:
+        duplicate = 1
+        while (key, duplicate) in buttons_with_keys:
+            duplicate += 1
+        key = (key, duplicate)
+    buttons_with_keys[key] = button
+    button.cb_key = key
+    return key
+
+
+def previous(button) -> Optional[Any]:
+    if (previous_button := previous_buttons_with_keys.get(button.cb_key)) is None and \
+            (site_key := getattr(button, 'cb_site_key', None)) is not None:
+        previous_button = previous_buttons_with_site_keys.get(site_key)
+    return previous_button
+
+
+def retain(button, previous_button):
+    previous_button.cb_key = button.cb_key
+    buttons_with_keys[button.cb_key] = previous_button
+    if (site_key := getattr(button, 'cb_site_key', None)) is not None:
+        previous_button.cb_site_key = site_key
+        buttons_with_site_keys[site_key] = previous_button
+
+
+def tick():
+    global buttons_with_keys, previous_buttons_with_keys, buttons_with_site_keys, previous_buttons_with_site_keys
+    buttons_with_keys, previous_buttons_with_keys = {}, buttons_with_keys
+    buttons_with_site_keys, previous_buttons_with_site_keys = {}, buttons_with_site_keys
+    call_site_counts.clear()
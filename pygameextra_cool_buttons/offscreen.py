@@ -0,0 +1,142 @@
+from typing import Any, Dict, Iterable, Tuple, Type, Union
+
+import numpy
+import pygame
+import pygameextra
+
+from pygameextra_cool_buttons import surfaces
+from pygameextra_cool_buttons.button_expansion import button_expansion_map
+from pygameextra_cool_buttons.buttons import WrappedButtonClass
+from pygameextra_cool_buttons.color import UniqueColor
+from pygameextra_cool_buttons.style import DEFAULT_STYLE, ButtonStyle
+
+Resource = Union[tuple, UniqueColor, pygameextra.Image]
+
+
+def _resolve_color(resource: Any, time: float) -> Any:
+    if not isinstance(resource, UniqueColor):
+        return resource
+    # Without a game context there's no frame clock, so animated colors are sampled at a fixed time
+    if hasattr(resource, 'get_color_at_time'):
+        return resource.get_color_at_time(time)
+    return resource.get_color(resource.Info())
+
+
+def _text(text: Union[str, pygameextra.Text, None], area: tuple) -> Union[pygameextra.Text, None]:
+    if isinstance(text, str):
+        return pygameextra.Text(text, font_size=area[3] // 2)
+    return text
+
+
+def get_bounds(area: tuple, style: ButtonStyle = None) -> pygame.Rect:
+    style = (style or DEFAULT_STYLE).resolved
+    bounds = pygame.Rect(*area)
+    if style.shadow:
+        bounds.union_ip(surfaces.get_shadow_bounds(WrappedButtonClass.get_shadow_area(tuple(area), style.shadow_offset),
+                                                   style.shadow_blur, style.shadow_spread))
+    return bounds
+
+
+def get_offset(area: tuple, style: ButtonStyle = None) -> Tuple[int, int]:
+    # Blurred or spread shadows can reach above and left of the origin, the button is moved to keep them in view
+    bounds = get_bounds(area, style)
+    return max(-bounds.left, 0), max(-bounds.top, 0)
+
+
+def get_size(area: tuple, style: ButtonStyle = None) -> Tuple[int, int]:
+    bounds = get_bounds(area, style)
+    offset_x, offset_y = get_offset(area, style)
+    return bounds.right + offset_x, bounds.bottom + offset_y
+
+
+def _draw(surface: pygameextra.Surface, area: tuple, inactive_resource: Resource = None,
+          active_resource: Resource = None, text: Union[str, pygameextra.Text] = None, style: ButtonStyle = None,
+          hovered: bool = False, pressed: bool = False, disabled: Union[bool, Resource] = False,
+          button_class: Type[WrappedButtonClass] = None, background: tuple = (0, 0, 0, 0), time: float = 0):
+    button_class = button_class or pygameextra.button.RectButton
+    style = style or DEFAULT_STYLE
+    if (expansion := button_expansion_map.get(button_class.__base_button__)) is not None:
+        attributes = expansion.__additional_attributes__
+        style = style.override(extra_kwargs={
+            name: value for name, value in attributes.items() if name not in style.extra_kwargs
+        })
+    offset_x, offset_y = get_offset(area, style)
+    style = style.resolved
+    area = (area[0] + offset_x, area[1] + offset_y, *area[2:])
+    shadow_color = _resolve_color(style.shadow_color, time) if style.shadow else None
+    dynamic_area = button_class.get_shadow_area(area, style.shadow_offset) \
+        if pressed and style.shadow else None
+    surface.surface.fill(background)
+    with surface:
+        button_class.static_render(area, _resolve_color(inactive_resource, time),
+                                   _resolve_color(active_resource, time), hovered or pressed,
+                                   _resolve_color(disabled, time), shadow_color=shadow_color,
+                                   dynamic_area=dynamic_area, style=style)
+        button_class.static_render_text(dynamic_area or area, _text(text, area))
+
+
+def _copy_pixels(surface: pygame.Surface, out: numpy.ndarray):
+    out[..., :3] = pygame.surfarray.pixels3d(surface).swapaxes(0, 1)
+    out[..., 3] = pygame.surfarray.pixels_alpha(surface).swapaxes(0, 1)
+
+
+def _output(out: numpy.ndarray, shape: tuple) -> numpy.ndarray:
+    if out is None:
+        return numpy.empty(shape, dtype=numpy.uint8)
+    if out.shape != shape or out.dtype != numpy.uint8:
+        raise ValueError(f"Output array must be uint8 with shape {shape}, got {out.dtype} {out.shape}")
+    return out
+
+
+def render_to_surface(area: tuple, inactive_resource: Resource = None, active_resource: Resource = None,
+                      text: Union[str, pygameextra.Text] = None, style: ButtonStyle = None,
+                      hovered: bool = False, pressed: bool = False, disabled: Union[bool, Resource] = False,
+                      button_class: Type[WrappedButtonClass] = None, size: Tuple[int, int] = None,
+                      background: tuple = (0, 0, 0, 0), time: float = 0) -> pygameextra.Surface:
+    surface = pygameextra.Surface(size or get_size(area, style))
+    _draw(surface, area, inactive_resource, active_resource, text, style, hovered, pressed, disabled,
+          button_class, background, time)
+    return surface
+
+
+def render_to_array(area: tuple, inactive_resource: Resource = None, active_resource: Resource = None,
+                    text: Union[str, pygameextra.Text] = None, style: ButtonStyle = None,
+                    hovered: bool = False, pressed: bool = False, disabled: Union[bool, Resource] = False,
+                    button_class: Type[WrappedButtonClass] = None, size: Tuple[int, int] = None,
+                    background: tuple = (0, 0, 0, 0), time: float = 0, out: numpy.ndarray = None) -> numpy.ndarray:
+    surface = render_to_surface(area, inactive_resource, active_resource, text, style, hovered, pressed, disabled,
+                                button_class, size, background, time)
+    width, height = surface.size
+    out = _output(out, (height, width, 4))
+    _copy_pixels(surface.surface, out)
+    return out
+
+
+def render_to_bytes(area: tuple, inactive_resource: Resource = None, active_resource: Resource = None,
+                    text: Union[str, pygameextra.Text] = None, style: ButtonStyle = None,
+                    hovered: bool = False, pressed: bool = False, disabled: Union[bool, Resource] = False,
+                    button_class: Type[WrappedButtonClass] = None, size: Tuple[int, int] = None,
+                    background: tuple = (0, 0, 0, 0), time: float = 0) -> bytes:
+    surface = render_to_surface(area, inactive_resource, active_resource, text, style, hovered, pressed, disabled,
+                                button_class, size, background, time)
+    return pygame.image.tobytes(surface.surface, 'RGBA')
+
+
+def render_batch(specs: Iterable[Dict[str, Any]], size: Tuple[int, int] = None,
+                 out: numpy.ndarray = None) -> numpy.ndarray:
+    # Each spec holds the keyword arguments of render_to_array except size and out, which the whole batch shares,
+    # every one is drawn onto the same reused canvas
+    specs = list(specs)
+    for spec in specs:
+        if (shared := {'size', 'out'}.intersection(spec)):
+            raise ValueError(f"render_batch specs can't set {', '.join(sorted(shared))}, pass it to render_batch")
+    if size is None:
+        sizes = [get_size(spec['area'], spec.get('style')) for spec in specs]
+        size = (max((width for width, _ in sizes), default=0), max((height for _, height in sizes), default=0))
+    width, height = size
+    out = _output(out, (len(specs), height, width, 4))
+    surface = pygameextra.Surface(size)
+    for spec, frame in zip(specs, out):
+        _draw(surface, **spec)
+        _copy_pixels(surface.surface, frame)
+    return out
@@ -0,0 +1,73 @@
+import logging
+from typing import Any, Hashable, Type, Union
+
+import pygameextra
+import pygameextra.button as buttons
+import pygameextra.settings as settings
+from pygameextra.button import ButtonAction, ButtonActionSet
+
+from pygameextra_cool_buttons import keys
+from pygameextra_cool_buttons.button_expansion import button_expansion_map
+from pygameextra_cool_buttons.buttons import WrappedButtonClass
+from pygameextra_cool_buttons.style import ButtonStyle
+
+MISSING = object()
+
+def make_action_set(hover_action: Any = None, hover_data: Any = None, action: Any = None, data: Any = None,
+                    hover_draw_action: Any = None, hover_draw_data: Any = None) -> ButtonActionSet:
+    action_set = ButtonActionSet(
+        hover=ButtonAction(action=hover_action, args=hover_data) if hover_action else None,
+        l_click=ButtonAction(action=action, args=data) if action else None,
+        hover_draw=ButtonAction(action=hover_draw_action, args=hover_draw_data) if hover_draw_action else None
+    )
+    ButtonActionSet.check(action_set)
+    return action_set
+
+
+class RetainedButton:
+    def __init__(self, area: tuple, inactive_resource=None, active_resource=None, text: pygameextra.Text = None,
+                 hover_action: Any = None, hover_data: Any = None, action: Any = None, data: Any = None,
+                 hover_draw_action: Any = None, hover_draw_data: Any = None, action_set: ButtonActionSet = None,
+                 disabled: Union[bool, tuple] = False, name: Hashable = None, key: Hashable = None,
+                 button_class: Type[WrappedButtonClass] = None, style: ButtonStyle = None, **kwargs):
+        if not action_set:
+            action_set = make_action_set(hover_action, hover_data, action, data, hover_draw_action, hover_draw_data)
+        else:
+            ButtonActionSet.check(action_set)
+        button_class = button_class or buttons.RectButton
+        self.extra_names = ()
+        if (expansion := button_expansion_map.get(button_class.__base_button__)) is not None:
+            self.extra_names = tuple(expansion.__additional_attributes__)
+            kwargs['extra_kwargs'] = {
+                **{name: kwargs.pop(name, value) for name, value in expansion.__additional_attributes__.items()},
+                **kwargs.get('extra_kwargs', {})
+            }
+        # The button outlives the frame, so the per-frame constructor, style override and carry over all go away
+        self.button = button_class(area, inactive_resource, active_resource, text, action_set, disabled, name,
+                                   style=style, **kwargs)
+        self.button.cool_button = True
+        self.key = key if key is not None else name if name is not None else self
+
+    def update(self, **changes):
+        # Expansion attributes live in the style's extra kwargs, like they do when the button is created
+        extra_kwargs = {name: changes.pop(name) for name in self.extra_names if name in changes}
+        if any(self.button.style.extra_kwargs.get(name, MISSING) != value for name, value in extra_kwargs.items()):
+            self.button.style = self.button.style.override(extra_kwargs=extra_kwargs)
+        for name, value in changes.items():
+            if getattr(self.button, name, MISSING) != value:
+                setattr(self.button, name, value)
+
+    def __call__(self, **changes):
+        if changes:
+            self.update(**changes)
+        if not settings.game_context and not hasattr(settings, 'cb_warn_retained_button'):
+            logging.warning("Retained cool buttons can only be drawn within a game context")
+            setattr(settings, 'cb_warn_retained_button', True)
+            return
+        elif not settings.game_context:
+            return
+        settings.game_context.buttons.append(self.button)
+        if self.button.name is not None:
+            settings.game_context.buttons_with_names[self.button.name] = self.button
+        keys.register(self.button, self.key)
+        buttons.check_hover(self.button)
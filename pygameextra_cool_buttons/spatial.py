@@ -0,0 +1,91 @@
+from functools import wraps
+from typing import Dict, List, Tuple
+
+import pygame
+import pygameextra.settings as settings
+from pygameextra import mouse
+from pygameextra.rect import Rect
+
+from pygameextra_cool_buttons import frame
+
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+mouse_events = False
+clicked_frame = -1
+clicked_sample: Tuple[bool, ...] = ()
+
+
+class SpatialIndex:
+    def __init__(self, cell_size: int):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.bounds: List[Rect] = []
+        self.layout = None
+        self.position = None
+        self.candidates: List[int] = []
+
+    @staticmethod
+    def get_hover_bounds(button) -> Rect:
+        bounds = Rect(*button.area)
+        if (style := getattr(button, 'style', None)) is not None and (style := style.resolved).shadow:
+            bounds.union_ip(button.get_shadow_area(tuple(button.area), style.shadow_offset))
+        bounds.move_ip(-button.mouse_offset[0], -button.mouse_offset[1])
+        return bounds
+
+    def build(self, buttons: list, layout: list):
+        self.cells = {}
+        self.bounds = []
+        self.layout = layout
+        self.position = None
+        for index, button in enumerate(buttons):
+            self.bounds.append(bounds := self.get_hover_bounds(button))
+            for x in range(bounds.left // self.cell_size, (bounds.right - 1) // self.cell_size + 1):
+                for y in range(bounds.top // self.cell_size, (bounds.bottom - 1) // self.cell_size + 1):
+                    self.cells.setdefault((x, y), []).append(index)
+
+    def query(self, position: tuple) -> List[int]:
+        self.position = position
+        cell = (int(position[0]) // self.cell_size, int(position[1]) // self.cell_size)
+        return [index for index in reversed(self.cells.get(cell, ())) if self.bounds[index].collidepoint(position)]
+
+
+def clicked() -> Tuple[bool, ...]:
+    global clicked_frame, clicked_sample
+    if clicked_frame != frame.index:
+        clicked_frame = frame.index
+        clicked_sample = mouse.clicked()
+    return clicked_sample
+
+
+def handle_buttons_wrapper(func):
+    @wraps(func)
+    def wrapper(self):
+        global mouse_events
+        if not settings.cb_spatial_hover:
+            return func(self)
+        if (index := getattr(self, 'cb_spatial_index', None)) is None:
+            self.cb_spatial_index = index = SpatialIndex(settings.cb_spatial_cell_size)
+        layout = [(button.area, button.mouse_offset) for button in self.buttons]
+        if layout != index.layout:
+            index.build(self.buttons, layout)
+        position = mouse.pos()
+        if mouse_events or position != index.position:
+            index.candidates = index.query(position)
+        mouse_events = False
+        for button_index in index.candidates:
+            (button := self.buttons[button_index]).logic()
+            if button.hovered:
+                break
+
+    return wrapper
+
+
+def event_get_wrapper(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        global mouse_events
+        events = func(*args, **kwargs)
+        mouse_events = mouse_events or any(e.type in MOUSE_EVENTS for e in events)
+        return events
+
+    return wrapper
@@ -0,0 +1,180 @@
+from types import MappingProxyType, ModuleType
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+import pygameextra.settings as settings
+
+from pygameextra_cool_buttons.cache import LRUCache
+
+EDGE_ROUNDINGS = ('edge_rounding', 'edge_rounding_topright', 'edge_rounding_topleft',
+                  'edge_rounding_bottomright', 'edge_rounding_bottomleft')
+FIELDS = ('shadow', 'shadow_color', 'shadow_offset', *EDGE_ROUNDINGS, 'shadow_blur', 'shadow_spread')
+
+resolved_styles = LRUCache('cb_style_cache_size')
+overridden_styles = LRUCache('cb_style_cache_size')
+resolved_version = -1
+INHERITED = (None, None, None, -1, -1, -1, -1, -1, None, None)
+watchers: Dict[str, List[Callable[[Any], None]]] = {}
+
+
+class VersionedSettings(ModuleType):
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name.startswith('cb_default_'):
+            super().__setattr__('cb_settings_version', self.__dict__.get('cb_settings_version', 0) + 1)
+        for watcher in watchers.get(name, ()):
+            watcher(value)
+
+
+def watch(name: str, watcher: Callable[[Any], None]):
+    watchers.setdefault(name, []).append(watcher)
+
+
+def track_settings():
+    if not isinstance(settings, VersionedSettings):
+        setattr(settings, 'cb_settings_version', 0)
+        settings.__class__ = VersionedSettings
+
+
+def inherits(name: str, value: Any) -> bool:
+    return value is None or (name in EDGE_ROUNDINGS and value == -1)
+
+
+def _freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+class _Identity:
+    # Stands in for an unhashable extra kwarg, the style holds the value so its id stays unique while it's compared
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _Identity) and other.value is self.value
+
+    def __hash__(self) -> int:
+        return id(self.value)
+
+
+def _freeze_extra_kwargs(extra_kwargs: Mapping[str, Any]) -> frozenset:
+    try:
+        return frozenset(extra_kwargs.items())
+    except TypeError:
+        items = []
+        for name, value in extra_kwargs.items():
+            try:
+                hash(value)
+            except TypeError:
+                value = _Identity(value)
+            items.append((name, value))
+        return frozenset(items)
+
+
+class ButtonStyle:
+    __slots__ = (*FIELDS, 'extra_kwargs', 'edge_roundings', '_key', '_hash', '_resolved', '_version')
+
+    shadow: bool
+    shadow_color: tuple
+    shadow_offset: tuple
+    edge_rounding: int
+    edge_rounding_topright: int
+    edge_rounding_topleft: int
+    edge_rounding_bottomright: int
+    edge_rounding_bottomleft: int
+    shadow_blur: int
+    shadow_spread: int
+    extra_kwargs: Mapping[str, Any]
+    edge_roundings: Tuple[int, int, int, int, int]
+
+    def __init__(self, shadow: bool = None, shadow_color: tuple = None, shadow_offset: tuple = None,
+                 edge_rounding: int = -1,
+                 edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+                 edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
+                 extra_kwargs: Mapping[str, Any] = {}, shadow_blur: int = None, shadow_spread: int = None):
+        values = (shadow, _freeze(shadow_color), _freeze(shadow_offset), edge_rounding,
+                  edge_rounding_topright, edge_rounding_topleft, edge_rounding_bottomright, edge_rounding_bottomleft,
+                  shadow_blur, shadow_spread)
+        for name, value in zip(FIELDS, values):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'extra_kwargs', MappingProxyType(dict(extra_kwargs)))
+        object.__setattr__(self, 'edge_roundings', values[3:8])
+        object.__setattr__(self, '_key', (*values, _freeze_extra_kwargs(extra_kwargs)))
+        object.__setattr__(self, '_hash', hash(self._key))
+        object.__setattr__(self, '_resolved', None)
+        object.__setattr__(self, '_version', -1)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead")
+
+    def __eq__(self, other: Any) -> bool:
+        return self is other or (isinstance(other, ButtonStyle) and self._key == other._key)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        fields = [f'{name}={getattr(self, name)!r}' for name in FIELDS if not inherits(name, getattr(self, name))]
+        if self.extra_kwargs:
+            fields.append(f'extra_kwargs={dict(self.extra_kwargs)!r}')
+        return f'{type(self).__name__}({", ".join(fields)})'
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**{name: getattr(self, name) for name in FIELDS}, 'extra_kwargs': self.extra_kwargs}
+
+    def replace(self, **changes) -> 'ButtonStyle':
+        return ButtonStyle(**{**self.as_dict(), **changes})
+
+    def _override(self, values: tuple, extra_kwargs: Mapping[str, Any]) -> 'ButtonStyle':
+        changes = {name: value for name, value in zip(FIELDS, values) if not inherits(name, value)}
+        if extra_kwargs:
+            changes['extra_kwargs'] = {**self.extra_kwargs, **extra_kwargs}
+        return self.replace(**changes) if changes else self
+
+    def override(self, shadow: bool = None, shadow_color: tuple = None, shadow_offset: tuple = None,
+                 edge_rounding: int = -1,
+                 edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+                 edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1,
+                 extra_kwargs: Mapping[str, Any] = {}, shadow_blur: int = None,
+                 shadow_spread: int = None) -> 'ButtonStyle':
+        values = (shadow, shadow_color, shadow_offset, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+                  edge_rounding_bottomright, edge_rounding_bottomleft, shadow_blur, shadow_spread)
+        if not extra_kwargs and values == INHERITED:
+            return self
+        # Buttons are rebuilt every frame with the same arguments, so the same style object comes back
+        try:
+            key = (self, values, frozenset(extra_kwargs.items()))
+            return overridden_styles.get(key, lambda: self._override(values, extra_kwargs))
+        except TypeError:
+            return self._override(values, extra_kwargs)
+
+    @property
+    def resolved(self) -> 'ButtonStyle':
+        if self._version != settings.cb_settings_version:
+            object.__setattr__(self, '_resolved', resolve(self))
+            object.__setattr__(self, '_version', settings.cb_settings_version)
+        return self._resolved
+
+
+def _resolve(style: ButtonStyle) -> ButtonStyle:
+    resolved = ButtonStyle(**{
+        name: getattr(settings, f'cb_default_{name}') if inherits(name, value) else value
+        for name, value in zip(FIELDS, style._key)
+    }, extra_kwargs=style.extra_kwargs)
+    object.__setattr__(resolved, '_resolved', resolved)
+    object.__setattr__(resolved, '_version', settings.cb_settings_version)
+    return resolved
+
+
+def resolve(style: ButtonStyle) -> ButtonStyle:
+    global resolved_version
+    if resolved_version != settings.cb_settings_version:
+        resolved_styles.clear()
+        resolved_version = settings.cb_settings_version
+    return resolved_styles.get(style, lambda: _resolve(style))
+
+
+DEFAULT_STYLE = ButtonStyle()
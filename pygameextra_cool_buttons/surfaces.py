@@ -0,0 +1,193 @@
+from typing import Callable
+
+import numpy
+import pygame
+import pygameextra.settings as settings
+from pygameextra import draw
+
+from pygameextra_cool_buttons import batch
+from pygameextra_cool_buttons.atlas import Atlas
+from pygameextra_cool_buttons.cache import LRUCache
+from pygameextra_cool_buttons.color import GradientFill
+
+baked_surfaces = LRUCache('cb_surface_cache_size')
+masks = LRUCache('cb_mask_cache_size')
+shadows = LRUCache('cb_shadow_cache_size')
+gradients = LRUCache('cb_gradient_cache_size')
+scaled_images = LRUCache('cb_image_cache_size')
+atlas = Atlas('cb_atlas_size', 'cb_atlas_pages')
+
+
+def stamp_baked(cache: LRUCache, key: tuple, factory: Callable[[], pygame.Surface], position: tuple):
+    if settings.cb_atlas:
+        # Every kind of baked surface shares the atlas, the cache name keeps their keys apart
+        page, area = atlas.get((cache.size_setting, *key), factory)
+        batch.blit(page, position, area)
+    else:
+        batch.blit(cache.get(key, factory), position)
+
+
+def bake_rect(color: tuple, size: tuple, w: int = 0, edge_rounding: int = -1,
+              edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+              edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1) -> pygame.Surface:
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, (0, 0, *size), w,
+                     border_radius=edge_rounding,
+                     border_top_left_radius=edge_rounding_topleft,
+                     border_top_right_radius=edge_rounding_topright,
+                     border_bottom_left_radius=edge_rounding_bottomleft,
+                     border_bottom_right_radius=edge_rounding_bottomright)
+    return surface
+
+
+class Mask:
+    __slots__ = ('surface', 'color')
+
+    def __init__(self, surface: pygame.Surface):
+        # Black with the shape in the alpha channel, tinting only ever touches the color channels
+        self.surface = surface
+        self.color = (0, 0, 0)
+
+    def tint(self, color: tuple) -> pygame.Surface:
+        if self.color != color[:3]:
+            self.surface.fill((0, 0, 0), special_flags=pygame.BLEND_RGB_MULT)
+            self.surface.fill(color[:3], special_flags=pygame.BLEND_RGB_ADD)
+            self.color = color[:3]
+        self.surface.set_alpha(color[3] if len(color) > 3 else 255)
+        return self.surface
+
+
+def tint_mask(color: tuple, size: tuple, w: int = 0, *edge_roundings: int) -> pygame.Surface:
+    return masks.get(
+        (size, w, *edge_roundings), lambda: Mask(bake_rect((0, 0, 0, 255), size, w, *edge_roundings))
+    ).tint(tuple(color))
+
+
+def bake_gradient(fill: GradientFill, size: tuple, w: int = 0, *edge_roundings: int) -> pygame.Surface:
+    surface = bake_rect((0, 0, 0, 255), size, w, *edge_roundings)
+    colors = fill.get_colors(size)
+    pygame.surfarray.pixels3d(surface)[:] = colors[..., :3]
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    # The rounded shape only ever cuts the gradient's own alpha
+    numpy.minimum(alpha, colors[..., 3], out=alpha)
+    del alpha
+    return surface
+
+
+def get_image_size(size: tuple, target: tuple, image_scale: str = None) -> tuple:
+    if image_scale == 'stretch':
+        return tuple(target)
+    if image_scale == 'fit':
+        scale = min(target[0] / size[0], target[1] / size[1])
+        return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+    return tuple(size)
+
+
+def bake_image(surface: pygame.Surface, size: tuple) -> pygame.Surface:
+    if surface.get_size() != size:
+        if surface.get_bitsize() < 24:
+            # smoothscale only takes 24 and 32 bit surfaces
+            source, surface = surface, pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            surface.blit(source, (0, 0))
+        surface = pygame.transform.smoothscale(surface, size)
+    if pygame.display.get_surface() is None:
+        # Converting needs a display mode, off-screen renders keep the source format
+        return surface
+    return surface.convert_alpha() if surface.get_alpha() is not None or surface.get_flags() & pygame.SRCALPHA \
+        else surface.convert()
+
+
+def image(surface: pygame.Surface, area: tuple, image_scale: str = None):
+    size = get_image_size(surface.get_size(), (area[2], area[3]), image_scale)
+    stamp_baked(scaled_images, (surface, size, pygame.display.get_surface() is None),
+                lambda: bake_image(surface, size),
+                (area[0] + area[2] * .5 - size[0] * .5, area[1] + area[3] * .5 - size[1] * .5))
+
+
+def gaussian_kernel(radius: int) -> numpy.ndarray:
+    x = numpy.arange(-radius, radius + 1, dtype=numpy.float32)
+    kernel = numpy.exp(-x ** 2 / (2 * (radius / 2) ** 2))
+    return kernel / kernel.sum()
+
+
+def _blur_rows(alpha: numpy.ndarray, kernel: numpy.ndarray) -> numpy.ndarray:
+    padded = numpy.pad(alpha, ((len(kernel) // 2, len(kernel) // 2), (0, 0)))
+    blurred = numpy.zeros_like(alpha)
+    for i, weight in enumerate(kernel):
+        blurred += weight * padded[i:i + len(alpha)]
+    return blurred
+
+
+def blur(alpha: numpy.ndarray, radius: int) -> numpy.ndarray:
+    kernel = gaussian_kernel(radius)
+    return _blur_rows(_blur_rows(alpha.astype(numpy.float32), kernel).T, kernel).T
+
+
+def bake_shadow(size: tuple, w: int, blur_radius: int, spread: int, *edge_roundings: int) -> Mask:
+    shape_size = (size[0] + spread * 2, size[1] + spread * 2)
+    shape = bake_rect((0, 0, 0, 255), shape_size, w,
+                      *(rounding + spread if rounding > 0 else rounding for rounding in edge_roundings))
+    surface = pygame.Surface((shape_size[0] + blur_radius * 2, shape_size[1] + blur_radius * 2), pygame.SRCALPHA)
+    surface.blit(shape, (blur_radius, blur_radius))
+    if blur_radius > 0:
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[:] = numpy.rint(blur(alpha, blur_radius))
+        del alpha
+    return Mask(surface)
+
+
+def shadow(color: tuple, area: tuple, w: int = 0, blur_radius: int = 0, spread: int = 0, edge_rounding: int = -1,
+           edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+           edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1):
+    if blur_radius <= 0 and spread <= 0:
+        rect(color, area, w, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+             edge_rounding_bottomright, edge_rounding_bottomleft)
+        return
+    # Blurring is far too slow to do per frame, so the blurred shape is cached and only ever tinted
+    size = (area[2], area[3])
+    key = (size, w, blur_radius, spread, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+           edge_rounding_bottomright, edge_rounding_bottomleft)
+    mask = shadows.get(key, lambda: bake_shadow(*key))
+    batch.blit(mask.tint(tuple(color)), (area[0] - blur_radius - spread, area[1] - blur_radius - spread),
+               batched=False)
+
+
+def get_shadow_bounds(area: tuple, blur_radius: int = 0, spread: int = 0) -> pygame.Rect:
+    padding = max(blur_radius, 0) + max(spread, 0)
+    return pygame.Rect(*area).inflate(padding * 2, padding * 2)
+
+
+def rect(color: tuple, area: tuple, w: int = 0, edge_rounding: int = -1,
+         edge_rounding_topright: int = -1, edge_rounding_topleft: int = -1,
+         edge_rounding_bottomright: int = -1, edge_rounding_bottomleft: int = -1):
+    if isinstance(color, GradientFill):
+        key = (color, (area[2], area[3]), w, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+               edge_rounding_bottomright, edge_rounding_bottomleft)
+        stamp_baked(gradients, key, lambda: bake_gradient(*key), (area[0], area[1]))
+        return
+    if settings.cb_mask_cache and len(color) > 3 and color[3] != 255:
+        batch.blit(
+            tint_mask(color, (area[2], area[3]), w, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+                      edge_rounding_bottomright, edge_rounding_bottomleft),
+            (area[0], area[1]), batched=False
+        )
+        return
+    if not settings.cb_surface_cache:
+        batch.flush_blits()
+        draw.rect(color, area, w,
+                  edge_rounding=edge_rounding,
+                  edge_rounding_topright=edge_rounding_topright,
+                  edge_rounding_topleft=edge_rounding_topleft,
+                  edge_rounding_bottomright=edge_rounding_bottomright,
+                  edge_rounding_bottomleft=edge_rounding_bottomleft)
+        return
+    size = (area[2], area[3])
+    color = tuple(color)
+    stamp_baked(
+        baked_surfaces,
+        (size, color, w, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+         edge_rounding_bottomright, edge_rounding_bottomleft),
+        lambda: bake_rect(color, size, w, edge_rounding, edge_rounding_topright, edge_rounding_topleft,
+                          edge_rounding_bottomright, edge_rounding_bottomleft),
+        (area[0], area[1])
+    )
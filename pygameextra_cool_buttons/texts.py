@@ -0,0 +1,21 @@
+from typing import Union
+
+import pygame
+import pygameextra
+from pygameextra.assets import ASSET_FONT
+
+from pygameextra_cool_buttons.cache import SizedLRUCache
+
+
+def surface_bytes(text: pygameextra.Text) -> int:
+    return text.obj.get_width() * text.obj.get_height() * text.obj.get_bytesize()
+
+
+cached_texts = SizedLRUCache('cb_text_cache_bytes', surface_bytes)
+
+
+def text(string: str, font: Union[str, pygame.font.Font] = ASSET_FONT, font_size: int = 20,
+         colors: Union[tuple, list] = ((255, 255, 255), None), antialias: bool = True) -> pygameextra.Text:
+    colors = tuple(tuple(color) if color is not None else None for color in colors)
+    return cached_texts.get((string, font, font_size, colors, antialias),
+                            lambda: pygameextra.Text(string, font, font_size, colors=colors, antialias=antialias))
@@ -1,17 +1,16 @@
-import glob
+import argparse
 import math
+import multiprocessing
 import os
-import tempfile
-import threading
 import time
-import atexit
-import shutil
+import numpy
 import pygameextra as pe
 import pygameextra_cool_buttons
+from pygameextra_cool_buttons import batch, keys, texts
 from pygameextra_cool_buttons.color import *
 from functools import wraps, lru_cache
-from typing import Type, Generator, Tuple, Union
-from PIL import Image
+from typing import Type, Generator, List, Tuple, Union
+from pygameextra_cool_buttons_tester.gif import GifStream
 
 pe.settings.cb_default_edge_rounding = 4
 pe.settings.cb_default_shadow = True
@@ -37,13 +36,14 @@ class ButtonRecorderMixin(pe.Button):
     RECORDING_CLICK_HOLD = .3
     RECORDING_TIME_OUT = 4
     RECORDING_TIME = RECORDING_TIME_IN + RECORDING_TIME_HOLD + RECORDING_TIME_OUT
+    RECORDING_GIF_FPS = RECORDING_FRAMES / 1.5
 
     button_name: str
     recording: bool
     recording_state: int
     recording_start: float
     recording_capture_index: int
-    recording_temp_dir: str
+    recording_stream: GifStream = None
     _hovered: bool
     _area: Tuple[int, int, int, int]
     _surface: pe.Surface = None
@@ -54,9 +54,18 @@ class ButtonRecorderMixin(pe.Button):
     # state 1: mouse in
     # state 2: mouse going out
 
+    @staticmethod
+    def now():
+        virtual_time = getattr(pe.settings.game_context, 'virtual_time', None)
+        return time.time() if virtual_time is None else virtual_time
+
+    @property
+    def offline(self):
+        return getattr(pe.settings.game_context, 'virtual_time', None) is not None
+
     @property
     def elapsed(self):
-        return time.time() - self.recording_start
+        return self.now() - self.recording_start
 
     @property
     @lru_cache()
@@ -80,23 +89,19 @@ class ButtonRecorderMixin(pe.Button):
         elif self.elapsed >= self.RECORDING_TIME:
             self.recording = False
             self.recording_state = -1
-            threading.Thread(target=self.save_gif, daemon=True).start()
+            self.recording_stream.close()
             RECORDING_IN_PROGRESS = False
 
-    def save_gif(self):
-        frames = [
-            Image.open(image)
-            for image in sorted(
-                glob.glob(
-                    f"{self.recording_temp_dir}/*.png"),
-                key=lambda x: int(os.path.basename(x).split('.')[0])
-            )
-        ]
-        frame_one = frames[0]
-        frame_one.save(os.path.join(RECORDING_DIRECTORY, f"{self.button_name}.gif"), format="GIF",
-                       append_images=frames,
-                       save_all=True, fps=self.RECORDING_FRAMES / 1.5,
-                       loop=0)
+    def start_recording_stream(self):
+        self.recording_stream = GifStream(os.path.join(RECORDING_DIRECTORY, f"{self.button_name}.gif"),
+                                          self.RECORDING_SURFACE_AREA, 1000 / self.RECORDING_GIF_FPS)
+
+    def capture_frame(self):
+        # Copy straight out of the surface buffer into the next free slot of the encoder's ring
+        frame = self.recording_stream.slot()
+        numpy.copyto(frame[..., :3], pe.pygame.surfarray.pixels3d(self._surface.surface).swapaxes(0, 1))
+        numpy.copyto(frame[..., 3], pe.pygame.surfarray.pixels_alpha(self._surface.surface).swapaxes(0, 1))
+        self.recording_stream.push()
 
     @property
     def area(self):
@@ -158,12 +163,15 @@ class ButtonRecorderMixin(pe.Button):
         if not self.recording:
             self._render(*args, **kwargs)
         else:
-            frame = int(self.RECORDING_FRAMES * (self.elapsed / self.RECORDING_TIME))
+            frame = int(self.RECORDING_FRAMES * self.elapsed / self.RECORDING_TIME)
 
             @pe.display.context_wrap(self.surface)
             def wrapped():
 
                 self._render(*args, **kwargs)
+                if pe.settings.cb_deferred:
+                    # The capture reads the surface right away, so the button can't wait for the frame's flush
+                    batch.flush()
 
                 if self.recording_capture_index < frame:
                     if self.spoof_mouse_click:
@@ -179,9 +187,7 @@ class ButtonRecorderMixin(pe.Button):
                     )
 
                     self.recording_capture_index = frame
-                    pe.pygame.image.save(self._surface.surface,
-                                         os.path.join('recording',
-                                                      os.path.join(self.recording_temp_dir, f'{frame}.png')))
+                    self.capture_frame()
 
             wrapped()
 
@@ -197,16 +203,11 @@ class ButtonRecorderMixin(pe.Button):
     def hovered(self, value):
         self._hovered = value
 
-    @staticmethod
-    @lru_cache
-    def _get_text(text, size):
-        return pe.Text(text, font_size=size)
-
     @property
     def text(self):
-        return self._get_text(
+        return texts.text(
             self.button_name if not self.recording else self.RECORDING_TEXT,
-            self.area[3] // 2
+            font_size=self.area[3] // 2
         )
 
     @text.setter
@@ -221,7 +222,6 @@ def class_recordable_wrapper(cls: Type[pe.Button]):
         def __init__(self, area, *args, **kwargs):
             super().__init__(area, *args, **kwargs)
             self.button_name = None
-            self.recording_temp_dir = None
             self.recording = False
             self.recording_state = -1
             self.recording_start = 0
@@ -238,7 +238,11 @@ def class_recordable_wrapper(cls: Type[pe.Button]):
                 self._hovered = False
                 self.recording_state = 0
                 self.recording_capture_index = -1
-                self.recording_start = time.time()
+                self.start_recording_stream()
+                if self.offline:
+                    # Restart color animations so offline recordings don't depend on the live history
+                    self.infos = {}
+                self.recording_start = self.now()
             elif self.recording:
                 self.handle_recording()
 
@@ -248,18 +252,14 @@ def class_recordable_wrapper(cls: Type[pe.Button]):
 def button_naming_wrapper(func):
     @wraps(func)
     def wrapper(*args, button_name=None, **kwargs):
-        func(*args, **kwargs)
+        func(*args, key=button_name, **kwargs)
 
         # Retain buttons instead of generating new ones
-        for previous_button in pe.settings.game_context.previous_buttons:
-            if previous_button.button_name == button_name:
-                del pe.settings.game_context.buttons[-1]
-                pe.settings.game_context.buttons.append(previous_button)
-                break
+        if (previous_button := keys.previous(pe.settings.game_context.buttons[-1])) is not None:
+            keys.retain(pe.settings.game_context.buttons[-1], previous_button)
+            pe.settings.game_context.buttons[-1] = previous_button
         if not pe.settings.game_context.buttons[-1].button_name:
             pe.settings.game_context.buttons[-1].button_name = button_name
-            pe.settings.game_context.buttons[-1].recording_temp_dir = tempfile.mkdtemp()
-            atexit.register(shutil.rmtree, pe.settings.game_context.buttons[-1].recording_temp_dir)
         pe.button.check_hover(pe.settings.game_context.buttons[-1])
 
     return wrapper
@@ -315,17 +315,48 @@ class Context(pe.GameContext):
     IMAGE_A: pe.Image
     IMAGE_B: pe.Image
     FPS_LOGGER = True
+    RECORDING_OFFLINE = False
 
     def __init__(self):
         super().__init__()
         self.trigger_recording = False
+        self.virtual_frame = None
         self.IMAGE_A = pe.Image(os.path.join(SCRIPT_DIR, 'IMAGE_A.png'), self.BUTTON_SIZE)
         self.IMAGE_B = pe.Image(os.path.join(SCRIPT_DIR, 'IMAGE_B.png'), self.BUTTON_SIZE)
 
     def handle_event(self, _):
         super().handle_event(_)
         if pe.event.key_DOWN(pe.K_r):
-            self.trigger_recording = True
+            self.start_recording()
+
+    def start_recording(self):
+        self.trigger_recording = True
+        if self.RECORDING_OFFLINE:
+            self.virtual_frame = 0
+
+    @property
+    def virtual_time(self):
+        if self.virtual_frame is None:
+            return None
+        # Multiply before dividing so every frame lands exactly on its capture index
+        return self.virtual_frame * ButtonRecorderMixin.RECORDING_TIME / ButtonRecorderMixin.RECORDING_FRAMES
+
+    @property
+    def delta_time(self):
+        if self.virtual_frame is None:
+            return super().delta_time
+        return ButtonRecorderMixin.RECORDING_TIME / ButtonRecorderMixin.RECORDING_FRAMES
+
+    def __call__(self):
+        super().__call__()
+        if self.virtual_frame is None:
+            return
+        # Step the virtual clock one recording frame at a time until the recording is done
+        while RECORDING_IN_PROGRESS:
+            self.virtual_frame += 1
+            super().__call__()
+        self.virtual_frame = None
+        self.trigger_recording = False
 
     @classmethod
     def position_generator(cls):
@@ -355,7 +386,62 @@ class Context(pe.GameContext):
         self.positions = self.position_generator()
 
 
-def run():
+class RecordingContext(Context):
+    FPS_LOGGER = False
+    RECORDING_OFFLINE = True
+
+
+def _initialize_recording_worker(directory: str):
+    global RECORDING_DIRECTORY
+    RECORDING_DIRECTORY = directory
+
+
+def _discover_buttons() -> List[str]:
+    context = RecordingContext()
+    context()
+    return [button.button_name for button in context.buttons if button.button_name]
+
+
+def _record_button(button_name: str) -> str:
+    context = RecordingContext()
+    context()
+    button = next(button for button in context.buttons if button.button_name == button_name)
+    pe.settings.spoof_mouse_position = pe.math.center(button.area)
+    context()
+    context.start_recording()
+    context()
+    pe.settings.spoof_mouse_position = None
+    button = next(button for button in context.previous_buttons if button.button_name == button_name)
+    button.recording_stream.join()
+    return os.path.join(RECORDING_DIRECTORY, f"{button_name}.gif")
+
+
+def record_all(jobs: int = None, directory: str = RECORDING_DIRECTORY):
+    # Workers render headlessly, spawned so they import pygame with the dummy drivers
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.makedirs(directory, exist_ok=True)
+    with multiprocessing.get_context('spawn').Pool(jobs, _initialize_recording_worker, (directory,)) as pool:
+        for path in pool.imap_unordered(_record_button, pool.apply(_discover_buttons)):
+            print(path)
+        # SDL turns SIGTERM into a quit event, so let the workers exit on their own instead of terminating them
+        pool.close()
+        pool.join()
+
+
+def run(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Cool buttons tester, press R while hovering a button to record it')
+    parser.add_argument('--record-all', action='store_true',
+                        help='Record every named button headlessly and exit')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of recording processes, defaults to the number of CPUs')
+    parser.add_argument('--output', default=RECORDING_DIRECTORY, help='Directory the recordings are saved to')
+    args = parser.parse_args(argv)
+
+    if args.record_all:
+        record_all(args.jobs, args.output)
+        return
+
     context = Context()
     while True:
         context()
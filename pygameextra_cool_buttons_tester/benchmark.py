@@ -0,0 +1,172 @@
+import argparse
+import ast
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygameextra as pe
+from pygameextra_cool_buttons import instrumentation
+from pygameextra_cool_buttons_tester import Context, cb
+
+SIZES = (10, 100, 1000, 10000)
+SCENARIOS: Dict[str, Callable[['BenchmarkContext', tuple, str], None]] = {
+    'action': lambda context, area, name: cb.action(area, button_name=name, shadow=False),
+    'rect': lambda context, area, name: cb.rect(area, context.COLOR_A, context.COLOR_B,
+                                                button_name=name, shadow=False),
+    'image': lambda context, area, name: cb.image(area, context.IMAGE_A, context.IMAGE_B,
+                                                  button_name=name, shadow=False),
+    'shadow': lambda context, area, name: cb.rect(area, context.COLOR_A, context.COLOR_B, button_name=name,
+                                                  shadow=True, shadow_offset=(0, 3),
+                                                  shadow_color=context.COLOR_B_PULSING),
+    'outline': lambda context, area, name: cb.rect(area, context.COLOR_A, context.COLOR_B, button_name=name,
+                                                   shadow=False, inactive_resource_width=2, active_resource_width=4),
+    'pulsing': lambda context, area, name: cb.rect(area, context.COLOR_A_PULSING, context.COLOR_B_PULSING,
+                                                   button_name=name, shadow=False),
+}
+
+
+class BenchmarkContext(Context):
+    FPS_LOGGER = False
+    BUTTON_SIZE = (40, 16)
+    BUTTON_PADDING = 4
+
+    def __init__(self, scenario: str, count: int):
+        self.scenario = scenario
+        self.count = count if scenario != 'loop' else 6
+        if scenario != 'loop':
+            columns = math.ceil(math.sqrt(count))
+            rows = math.ceil(count / columns)
+            width, height = (size + self.BUTTON_PADDING for size in self.BUTTON_SIZE)
+            self.AREA = (columns * width + self.BUTTON_PADDING, rows * height + self.BUTTON_PADDING)
+            self.areas = [
+                (self.BUTTON_PADDING + (i % columns) * width, self.BUTTON_PADDING + (i // columns) * height,
+                 *self.BUTTON_SIZE) for i in range(count)
+            ]
+        super().__init__()
+
+    def loop(self):
+        if self.scenario == 'loop':
+            return super().loop()
+        render = SCENARIOS[self.scenario]
+        for i, area in enumerate(self.areas):
+            render(self, area, f'{self.scenario} {i}')
+
+
+def mouse_position(index: int, size: Tuple[int, int]) -> Tuple[int, int]:
+    return (index * 37) % size[0], (index * 23) % size[1]
+
+
+def benchmark(scenario: str, count: int, frames: int, warmup: int) -> dict:
+    context = BenchmarkContext(scenario, count)
+    size = pe.display.get_size()
+    for i in range(warmup):
+        pe.settings.spoof_mouse_position = mouse_position(i, size)
+        context()
+    instrumentation.reset()
+    frame_times: List[float] = []
+    for i in range(frames):
+        pe.settings.spoof_mouse_position = mouse_position(warmup + i, size)
+        start = time.perf_counter()
+        context()
+        frame_times.append(time.perf_counter() - start)
+    pe.settings.spoof_mouse_position = None
+    frame_times.sort()
+    total = sum(frame_times)
+    result = {
+        'scenario': scenario,
+        'buttons': context.count,
+        'frames': frames,
+        'fps': frames / total,
+        'frame_ms': total / frames * 1000,
+        'median_frame_ms': frame_times[len(frame_times) // 2] * 1000,
+        'p95_frame_ms': frame_times[min(len(frame_times) - 1, int(len(frame_times) * .95))] * 1000,
+        'button_us': total / frames / context.count * 1000000,
+    }
+    if pe.settings.cb_instrumentation:
+        result['instrumentation'] = instrumentation.summary(top=0)
+        del result['instrumentation']['buttons'], result['instrumentation']['styles']
+    return result
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    # The report can be on stdout, so the table goes with the progress lines
+    print(f"{'benchmark':<20}{'baseline ms':>14}{'current ms':>14}{'change':>10}", file=sys.stderr)
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['frame_ms'], result['frame_ms']
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<20}{before:>14.3f}{after:>14.3f}{change:>+10.1%}{flag}", file=sys.stderr)
+    return regressions
+
+
+def parse_setting(value: str) -> Tuple[str, object]:
+    name, _, literal = value.partition('=')
+    return name, ast.literal_eval(literal)
+
+
+def run(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Headless benchmark of the cool buttons render pipeline')
+    parser.add_argument('--scenarios', nargs='+', choices=['loop', *SCENARIOS], default=['loop', *SCENARIOS])
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--button-budget', type=int, default=100000,
+                        help='Cap frames so that frames * buttons stays under this budget (minimum 5 frames)')
+    parser.add_argument('--set', dest='settings', action='append', type=parse_setting, default=[],
+                        metavar='NAME=VALUE', help='Override a pygameextra setting, e.g. cb_surface_cache=True')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a saved JSON baseline')
+    parser.add_argument('--threshold', type=float, default=.1,
+                        help='Relative frame time increase reported as a regression')
+    args = parser.parse_args(argv)
+
+    for name, value in args.settings:
+        setattr(pe.settings, name, value)
+
+    results = {}
+    for scenario in args.scenarios:
+        for count in ([6] if scenario == 'loop' else args.sizes):
+            frames = max(5, min(args.frames, args.button_budget // count))
+            result = benchmark(scenario, count, frames, args.warmup)
+            results[name := f'{scenario}-{result["buttons"]}'] = result
+            print(f"{name:<20}{result['fps']:>10.1f} fps{result['frame_ms']:>10.3f} ms/frame"
+                  f"{result['button_us']:>10.2f} us/button", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pe.pygame.version.ver,
+            'platform': platform.platform(),
+            'time': time.time(),
+            'settings': {name: repr(value) for name, value in vars(pe.settings).items() if name.startswith('cb_')},
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, default=repr)
+    else:
+        print(json.dumps(report, indent=2, default=repr))
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,146 @@
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy
+from PIL import GifImagePlugin, Image
+
+PALETTE_FRAMES = 16
+PALETTE_RESERVE = 32
+PALETTE_TOLERANCE = 12
+
+
+class GifWriter:
+    def __init__(self, file: BinaryIO, duration: float, palette_frames: int = PALETTE_FRAMES, loop: int = 0,
+                 palette_reserve: int = PALETTE_RESERVE, palette_tolerance: int = PALETTE_TOLERANCE):
+        self.file = file
+        self.duration = duration
+        self.palette_frames = palette_frames
+        self.loop = loop
+        self.palette_reserve = palette_reserve
+        self.palette_tolerance = palette_tolerance
+        self.palette: Optional[Image.Image] = None
+        self.palette_offset = 0
+        self.pending: List[numpy.ndarray] = []
+
+    def add(self, frame: numpy.ndarray):
+        if self.palette is not None:
+            self._write(frame[..., :3])
+            return
+        # Only the first palette_frames frames are held, everything after them is written as it arrives
+        self.pending.append(frame[..., :3].copy())
+        if len(self.pending) >= self.palette_frames:
+            self._start()
+
+    def _start(self):
+        # The reserved entries are filled by colors that only show up later in the clip
+        self.palette = Image.fromarray(numpy.concatenate(self.pending)).quantize(
+            256 - self.palette_reserve, dither=Image.Dither.NONE)
+        height, width = self.pending[0].shape[:2]
+        canvas = Image.new('P', (width, height))
+        canvas.putpalette(self._global_palette())
+        header, _ = GifImagePlugin.getheader(canvas, info={'loop': self.loop, 'duration': self.duration})
+        self.palette_offset = self.file.tell() + sum(map(len, header[:3]))
+        self.file.writelines(header)
+        for frame in self.pending:
+            self._write(frame)
+        self.pending.clear()
+
+    def _global_palette(self) -> List[int]:
+        # Always a full table, so entries added later can be patched in place
+        palette = self.palette.getpalette()
+        return palette + [0] * (768 - len(palette))
+
+    def _write(self, frame: numpy.ndarray):
+        image = Image.fromarray(frame).quantize(palette=self.palette, dither=Image.Dither.NONE)
+        free = 256 - len(self.palette.getpalette()) // 3
+        if free:
+            error = numpy.abs(numpy.asarray(image.convert('RGB'), dtype=numpy.int16) - frame).max(axis=-1)
+            missed = frame[error > self.palette_tolerance]
+            if len(missed):
+                # Appended entries leave the indices of frames already written untouched
+                added = Image.fromarray(missed[numpy.newaxis]).quantize(free, dither=Image.Dither.NONE)
+                self.palette.putpalette(self.palette.getpalette() + added.getpalette())
+                image = Image.fromarray(frame).quantize(palette=self.palette, dither=Image.Dither.NONE)
+        self.file.writelines(GifImagePlugin.getdata(image, duration=self.duration))
+
+    def close(self):
+        if self.pending:
+            self._start()
+        if self.palette is not None:
+            end = self.file.tell()
+            self.file.seek(self.palette_offset)
+            self.file.write(bytes(self._global_palette()))
+            self.file.seek(end)
+        self.file.write(b';')
+
+
+def _encode(path: str, name: str, shape: Tuple[int, ...], queue, free, ready, duration: float,
+            palette_frames: int):
+    memory = SharedMemory(name)
+    ready.set()
+    frames = numpy.ndarray(shape, dtype=numpy.uint8, buffer=memory.buf)
+    with open(path, 'wb') as file:
+        writer = GifWriter(file, duration, palette_frames)
+        while (index := queue.get()) is not None:
+            writer.add(frames[index])
+            free.release()
+        writer.close()
+    del frames
+    memory.close()
+
+
+class GifStream:
+    def __init__(self, path: str, size: Tuple[int, int], duration: float, capacity: int = 8,
+                 palette_frames: int = PALETTE_FRAMES, separate_process: bool = None):
+        width, height = size
+        if separate_process is None:
+            # Daemonic processes, like pool workers, can't start an encoder process of their own
+            separate_process = not multiprocessing.current_process().daemon
+        if not separate_process:
+            self.process = None
+            self.file = open(path, 'wb')
+            self.writer = GifWriter(self.file, duration, palette_frames)
+            self.frames = numpy.empty((1, height, width, 4), dtype=numpy.uint8)
+            self.count = 0
+            return
+        context = multiprocessing.get_context('spawn')
+        shape = (capacity, height, width, 4)
+        self.memory = SharedMemory(create=True, size=int(numpy.prod(shape)))
+        self.frames = numpy.ndarray(shape, dtype=numpy.uint8, buffer=self.memory.buf)
+        self.count = 0
+        self.free = context.Semaphore(capacity)
+        self.ready = context.Event()
+        self.queue = context.SimpleQueue()
+        self.process = context.Process(target=_encode, daemon=True, args=(
+            path, self.memory.name, shape, self.queue, self.free, self.ready, duration, palette_frames))
+        self.process.start()
+
+    def slot(self) -> numpy.ndarray:
+        if self.process is not None:
+            # Blocks while the encoder is a full ring behind
+            self.free.acquire()
+        return self.frames[self.count % len(self.frames)]
+
+    def push(self):
+        if self.process is None:
+            self.writer.add(self.frames[self.count % len(self.frames)])
+        else:
+            self.queue.put(self.count % len(self.frames))
+        self.count += 1
+
+    def close(self):
+        if self.process is None:
+            self.writer.close()
+            self.file.close()
+            return
+        self.queue.put(None)
+        # The encoder keeps its own mapping, so the name can go as soon as it has attached
+        self.ready.wait()
+        del self.frames
+        self.memory.close()
+        self.memory.unlink()
+
+    def join(self, timeout: float = None):
+        if self.process is not None:
+            self.process.join(timeout)
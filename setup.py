@@ -17,7 +17,7 @@ setup(
     long_description_content_type="text/markdown",
     long_description=long,
     packages=['pygameextra_cool_buttons', 'pygameextra_cool_buttons_tester'],
-    install_requires=['pygameextra>=2.0.0b45', 'Pillow'],
+    install_requires=['pygameextra>=2.0.0b45', 'Pillow', 'numpy'],
     package_data={
         'pygameextra_cool_buttons_tester': ['IMAGE_A.png', 'IMAGE_B.png'],
     },
@@ -25,6 +25,7 @@ setup(
     entry_points={
         'console_scripts': [
             'pygameextra-cb-tester = pygameextra_cool_buttons_tester.__init__:run',
+            'pygameextra-cb-benchmark = pygameextra_cool_buttons_tester.benchmark:run',
         ],
     }
 )
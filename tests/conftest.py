@@ -0,0 +1,49 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy
+import pygame
+import pygameextra as pe
+import pytest
+
+import pygameextra_cool_buttons  # noqa: F401 - installs the cool buttons wrappers
+from pygameextra_cool_buttons import keys
+
+pe.init()
+
+
+def pixels(surface: pe.Surface) -> numpy.ndarray:
+    return numpy.dstack((pygame.surfarray.array3d(surface.surface), pygame.surfarray.array_alpha(surface.surface)))
+
+
+def draw(size: tuple, func, *args, **kwargs) -> numpy.ndarray:
+    surface = pe.Surface(size)
+    with surface:
+        func(*args, **kwargs)
+    return pixels(surface)
+
+
+@pytest.fixture
+def game_context():
+    def make(loop, area: tuple = (200, 200), delta_time: float = 1 / 30, background: tuple = (0, 0, 0)):
+        class Context(pe.GameContext):
+            AREA = area
+            BACKGROUND = background
+            FPS_LOGGER = False
+
+            @property
+            def delta_time(self):
+                return delta_time
+
+            def loop(self):
+                loop()
+
+        return Context()
+
+    yield make
+    pe.settings.game_context = None
+    # Buttons are matched across frames by key, so a later test must not pick up this test's buttons
+    keys.tick()
+    keys.tick()
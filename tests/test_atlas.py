@@ -0,0 +1,75 @@
+import numpy
+import pygame
+import pygameextra.settings as settings
+import pytest
+
+from pygameextra_cool_buttons.atlas import Atlas
+
+
+@pytest.fixture
+def atlas(monkeypatch):
+    monkeypatch.setattr(settings, 'cb_test_atlas_size', 64, raising=False)
+    monkeypatch.setattr(settings, 'cb_test_atlas_pages', 1, raising=False)
+    return Atlas('cb_test_atlas_size', 'cb_test_atlas_pages')
+
+
+def sprite(size: tuple, seed: int) -> pygame.Surface:
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    rgba = numpy.random.default_rng(seed).integers(1, 256, (*size, 4), dtype=numpy.uint8)
+    pygame.surfarray.pixels3d(surface)[:] = rgba[..., :3]
+    pygame.surfarray.pixels_alpha(surface)[:] = rgba[..., 3]
+    return surface
+
+
+def pixels(surface: pygame.Surface, area=None) -> numpy.ndarray:
+    if area is not None:
+        surface = surface.subsurface(area)
+    return numpy.dstack((pygame.surfarray.array3d(surface), pygame.surfarray.array_alpha(surface)))
+
+
+def assert_packed(atlas: Atlas, key, size: tuple, seed: int):
+    page, area = atlas.get(key, lambda: pytest.fail(f"{key} was evicted"))
+    assert area is not None and area.size == size
+    assert numpy.array_equal(pixels(page, area), pixels(sprite(size, seed)))
+
+
+def test_items_are_copied_exactly_and_reused(atlas):
+    page, area = atlas.get('a', lambda: sprite((10, 12), 1))
+    assert numpy.array_equal(pixels(page, area), pixels(sprite((10, 12), 1)))
+    assert atlas.get('a', lambda: pytest.fail("built twice")) == (page, area)
+    assert (atlas.hits, atlas.misses) == (1, 1)
+
+
+def test_items_do_not_overlap(atlas):
+    areas = [atlas.get(index, lambda index=index: sprite((7 + index % 5, 5 + index % 3), index))[1]
+             for index in range(20)]
+    assert all(area.collidelist(areas[:index]) == -1 for index, area in enumerate(areas))
+    for index in range(20):
+        assert_packed(atlas, index, (7 + index % 5, 5 + index % 3), index)
+
+
+def test_oversized_items_bypass_the_atlas(atlas):
+    surface = sprite((80, 10), 1)
+    assert atlas.get('big', lambda: surface) == (surface, None)
+    assert 'big' not in atlas
+
+
+def test_full_atlas_repacks_keeping_recent_items(atlas):
+    for index in range(16):
+        atlas.get(index, lambda index=index: sprite((16, 16), index))
+    assert atlas.repacks == 0
+    # Touching the oldest item makes it recent, so it outlives the repack
+    atlas.get(0, lambda: pytest.fail("built twice"))
+    atlas.get('new', lambda: sprite((16, 16), 99))
+    assert atlas.repacks == 1 and atlas.evictions > 0
+    assert 0 in atlas and 1 not in atlas and 'new' in atlas
+    assert_packed(atlas, 0, (16, 16), 0)
+    assert_packed(atlas, 15, (16, 16), 15)
+    assert_packed(atlas, 'new', (16, 16), 99)
+    assert len(atlas) <= 64 * 64 // (16 * 16)
+
+
+def test_clear_drops_pages_and_counters(atlas):
+    atlas.get('a', lambda: sprite((4, 4), 1))
+    atlas.clear()
+    assert len(atlas) == 0 and not atlas.pages and (atlas.hits, atlas.misses) == (0, 0)
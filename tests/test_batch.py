@@ -0,0 +1,85 @@
+import numpy
+import pygameextra as pe
+import pytest
+
+from pygameextra_cool_buttons import batch
+from pygameextra_cool_buttons.cb import RetainedButton
+
+RED, GREEN, BLUE = (200, 40, 40), (40, 200, 40), (40, 40, 200)
+
+
+def frames(game_context, loop, deferred: bool, monkeypatch, count: int = 4) -> list:
+    monkeypatch.setattr(pe.settings, 'cb_deferred', deferred)
+    context = game_context(loop, background=(30, 30, 30))
+    screens = []
+    for index in range(count):
+        pe.settings.spoof_mouse_position = (30, 20) if index % 4 in (1, 2) else (190, 190)
+        context()
+        screens.append(pe.pygame.surfarray.array3d(pe.display.display_reference.surface))
+    pe.settings.spoof_mouse_position = None
+    return screens
+
+
+def assert_deferred_matches_immediate(game_context, make_loop, monkeypatch):
+    immediate = frames(game_context, make_loop(), False, monkeypatch)
+    deferred = frames(game_context, make_loop(), True, monkeypatch)
+    assert not batch.commands
+    assert all(numpy.array_equal(a, b) for a, b in zip(immediate, deferred))
+
+
+def test_overlapping_shadows_keep_declaration_order(game_context, monkeypatch):
+    text = pe.Text('Hi', font_size=12)
+
+    def loop():
+        # Each shadow reaches into the next button, and the styles alternate so grouping them would reorder
+        pe.button.rect((10, 10, 40, 20), RED, GREEN, shadow=True, shadow_offset=(8, 8), text=text)
+        pe.button.rect((20, 20, 40, 20), BLUE, GREEN, shadow=True, shadow_blur=4, edge_rounding=6)
+        pe.button.rect((30, 30, 40, 20), RED, GREEN, shadow=True, shadow_offset=(8, 8))
+        pe.button.rect((25, 15, 40, 20), GREEN, RED, shadow=True, shadow_blur=4, edge_rounding=6, text=text)
+        # Apart from the rest, so these are drawn pass by pass
+        for index in range(4):
+            pe.button.rect((110, 10 + index * 30, 40, 20), (RED, BLUE)[index % 2], GREEN, shadow=True,
+                           edge_rounding=index * 2)
+
+    assert_deferred_matches_immediate(game_context, lambda: loop, monkeypatch)
+
+
+def test_same_button_drawn_twice(game_context, monkeypatch):
+    def make_loop():
+        button = RetainedButton((10, 10, 40, 20), RED, GREEN, shadow=True)
+
+        def loop():
+            button()
+            button.button.render(area=(10, 100, 40, 20))
+
+        return loop
+
+    assert_deferred_matches_immediate(game_context, make_loop, monkeypatch)
+
+
+@pytest.mark.parametrize('background', (None, (30, 30, 30)))
+def test_exact_repeats_are_queued_once(game_context, monkeypatch, background):
+    monkeypatch.setattr(pe.settings, 'cb_deferred', True)
+    button = RetainedButton((10, 10, 40, 20), RED, GREEN, shadow=True)
+    queued = []
+
+    def loop():
+        button()
+        button.button.render()
+        queued.append(len(batch.commands))
+
+    game_context(loop, background=background)()
+    assert queued == [1]
+
+
+def test_style_groups_follow_queue_order(game_context, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_deferred', True)
+    groups = []
+
+    def loop():
+        for index in range(6):
+            pe.button.rect((10 + index * 30, 10, 20, 20), RED, GREEN, edge_rounding=(5, 2, 9)[index % 3])
+        groups.append([command.style for command in batch.commands])
+
+    game_context(loop)()
+    assert groups == [[0, 1, 2, 0, 1, 2]]
@@ -0,0 +1,43 @@
+import numpy
+import pytest
+from pygameextra import draw as pe_draw
+
+from pygameextra_cool_buttons import surfaces
+from pygameextra_cool_buttons.cache import LRUCache
+
+from conftest import draw
+
+ROUNDED = (4, -1, -1, -1, -1)
+
+
+@pytest.fixture
+def surface_cache(monkeypatch):
+    monkeypatch.setattr(surfaces.settings, 'cb_surface_cache', True)
+    surfaces.baked_surfaces.clear()
+    yield surfaces.baked_surfaces
+    surfaces.baked_surfaces.clear()
+
+
+def test_lru_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(surfaces.settings, 'cb_test_cache_size', 2, raising=False)
+    cache = LRUCache('cb_test_cache_size')
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: None)
+    cache.get('c', lambda: 3)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_baked_rect_matches_direct_draw(surface_cache):
+    area = (3, 4, 30, 20)
+    expected = draw((40, 30), pe_draw.rect, (200, 40, 40), area, 0, edge_rounding=4)
+    assert numpy.array_equal(draw((40, 30), surfaces.rect, (200, 40, 40), area, 0, *ROUNDED), expected)
+
+
+def test_baked_rect_is_reused_across_positions(surface_cache):
+    draw((80, 30), surfaces.rect, (200, 40, 40), (0, 0, 30, 20), 0, *ROUNDED)
+    draw((80, 30), surfaces.rect, (200, 40, 40), (40, 5, 30, 20), 0, *ROUNDED)
+    assert (surface_cache.hits, surface_cache.misses) == (1, 1)
+    draw((80, 30), surfaces.rect, (40, 200, 40), (40, 5, 30, 20), 0, *ROUNDED)
+    assert surface_cache.misses == 2
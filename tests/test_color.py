@@ -0,0 +1,107 @@
+import numpy
+import pygameextra as pe
+import pytest
+
+from pygameextra_cool_buttons import frame
+from pygameextra_cool_buttons.color import Color, CompiledPulsingColor, GradientColor, PartialGradientColor, \
+    PulsingColor, Timeline, UniqueColor
+
+
+class FixedStep:
+    delta_time = 1 / 30
+
+
+@pytest.fixture
+def fixed_step(monkeypatch):
+    monkeypatch.setattr(pe.settings, 'game_context', FixedStep())
+
+
+def gradient(*colors: tuple) -> GradientColor:
+    return GradientColor(*(PartialGradientColor(Color(color), index / (len(colors) - 1))
+                           for index, color in enumerate(colors)))
+
+
+def pulse(**kwargs) -> PulsingColor:
+    return PulsingColor(gradient((255, 0, 0), (0, 165, 255), (20, 255, 40)), .5, .2, .8, **kwargs)
+
+
+def test_static_colors_batch_from_percentages_and_infos():
+    color = Color((10, 20, 30))
+    assert color.get_colors([0, .5]).tolist() == [[10, 20, 30, 255]] * 2
+    assert color.get_colors([color.Info()]).tolist() == [[10, 20, 30, 255]]
+
+
+def test_gradient_batch_from_infos_matches_single_infos():
+    color = gradient((255, 0, 0), (0, 0, 255))
+    infos = [color.Info() for _ in range(5)]
+    for index, info in enumerate(infos):
+        info.percentage = index / 4
+    singles = [color.get_color(info) for info in infos]
+    assert color.get_colors(infos)[:, :3].tolist() == [list(single) for single in singles]
+
+
+def test_pulse_batch_advances_like_single_infos(fixed_step):
+    color = pulse()
+    singles, batch = [color.Info() for _ in range(3)], [color.Info() for _ in range(3)]
+    for _ in range(60):
+        expected = [color.get_color(info) for info in singles]
+        assert color.get_colors(batch)[:, :3].tolist() == [list(single) for single in expected]
+
+
+def test_custom_colors_batch_from_infos_only():
+    class Solid(UniqueColor):
+        def get_color(self, info) -> tuple:
+            return 1, 2, 3
+
+    assert Solid().get_colors([Solid.Info(), Solid.Info()]).tolist() == [[1, 2, 3, 255]] * 2
+    with pytest.raises(TypeError):
+        Solid().get_colors([.5])
+
+
+def test_shared_timelines(fixed_step):
+    assert pulse(timeline=True).timeline is pulse(timeline=True).timeline
+    assert pulse(timeline='menu').timeline is pulse(timeline='menu').timeline
+    assert pulse(timeline='menu').timeline is not pulse(timeline=True).timeline
+    assert pulse().timeline is None and pulse(timeline=False).timeline is None
+
+
+def test_timeline_colors_follow_the_frame_clock(fixed_step, monkeypatch):
+    color = pulse(timeline=Timeline('test'))
+    monkeypatch.setattr(frame, 'time', frame.time + .25)
+    monkeypatch.setattr(frame, 'index', frame.index + 1)
+    assert color.get_color(color.Info()) == color.get_color_at_time(.25)
+    assert color.get_colors([color.Info()] * 2)[:, :3].tolist() == [list(color.get_color_at_time(.25))] * 2
+
+
+@pytest.mark.parametrize('fps', (30, 60))
+def test_compiled_pulse_matches_live_pulse_at_its_fps(fixed_step, monkeypatch, fps):
+    monkeypatch.setattr(FixedStep, 'delta_time', 1 / fps)
+    live = PulsingColor(gradient((255, 0, 0), (0, 165, 255), (20, 255, 40)), .33, .1, .71)
+    compiled = live.compile(fps)
+    live_info, compiled_info = live.Info(), compiled.Info()
+    for _ in range(2000):
+        assert compiled.get_color(compiled_info) == live.get_color(live_info)
+    live_infos, compiled_infos = [live.Info() for _ in range(3)], [compiled.Info() for _ in range(3)]
+    for _ in range(200):
+        assert numpy.array_equal(compiled.get_colors(compiled_infos), live.get_colors(live_infos))
+
+
+def test_compiled_timeline_pulse_is_within_half_a_frame(fixed_step, monkeypatch):
+    live = pulse(timeline=Timeline('compiled'))
+    compiled = live.compile(30)
+    # The largest change between two frames, a nearest sample is off by at most half of it
+    step = max(max(abs(a - b) for a, b in zip(live.get_color_at_time(index / 30),
+                                               live.get_color_at_time((index + 1) / 30))) for index in range(60))
+    for index in range(90):
+        monkeypatch.setattr(frame, 'time', live.timeline.start + index / 30)
+        monkeypatch.setattr(frame, 'index', frame.index + 1)
+        expected, actual = live.get_color(live.Info()), compiled.get_color(compiled.Info())
+        assert max(abs(a - b) for a, b in zip(expected, actual)) <= step / 2 + 1
+
+
+def test_only_fixed_pulses_compile():
+    assert isinstance(pulse().compile(), CompiledPulsingColor)
+    nested = PulsingColor(GradientColor(PartialGradientColor(pulse(), 0), PartialGradientColor(Color((0, 0, 0)), 1)),
+                          1, 1, 1)
+    assert nested.compile() is nested
+    assert PulsingColor(gradient((0, 0, 0), (255, 255, 255)), 0, 0, 0).compile().__class__ is PulsingColor
@@ -0,0 +1,81 @@
+import numpy
+import pygameextra as pe
+import pytest
+
+from pygameextra_cool_buttons import dirty
+
+BACKGROUND = (40, 40, 40)
+
+
+@pytest.fixture(params=(False, True), ids=('immediate', 'deferred'))
+def dirty_tracking(request, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_dirty_tracking', True)
+    monkeypatch.setattr(pe.settings, 'cb_dirty_background', BACKGROUND)
+    monkeypatch.setattr(pe.settings, 'cb_deferred', request.param)
+
+
+def screen(area: tuple) -> numpy.ndarray:
+    x, y, width, height = area
+    return pe.pygame.surfarray.array3d(pe.display.display_reference.surface)[x:x + width, y:y + height]
+
+
+def scene(game_context, shown: dict):
+    def loop():
+        for name, area in (('a', (10, 10, 40, 20)), ('b', (10, 40, 40, 20)), ('c', (60, 10, 40, 20))):
+            if shown.get(name, True):
+                pe.button.rect(area, (200, 40, 40), (40, 200, 40), shadow=True)
+
+    context = game_context(loop, background=None)
+    pe.fill.full(BACKGROUND)
+    return context
+
+
+def test_unchanged_frames_are_not_dirty(game_context, dirty_tracking):
+    context = scene(game_context, {})
+    context()
+    assert dirty.collect_dirty_rects()
+    context()
+    assert dirty.collect_dirty_rects() == []
+
+
+def test_vanished_button_is_reported(game_context, dirty_tracking):
+    shown = {}
+    context = scene(game_context, shown)
+    context()
+    context()
+    shown['b'] = False
+    context()
+    rects = dirty.collect_dirty_rects()
+    assert any(rect.contains(pe.Rect(10, 40, 40, 20)) for rect in rects)
+    assert not any(rect.colliderect(pe.Rect(60, 10, 40, 20)) for rect in rects)
+
+
+def test_vanished_button_is_cleared_without_collecting(game_context, dirty_tracking):
+    shown = {}
+    context = scene(game_context, shown)
+    context()
+    shown['b'] = False
+    context()
+    assert (screen((10, 40, 40, 20)) == BACKGROUND).all()
+    # The neighbour's shadow overlapped the cleared region and is drawn back
+    assert not (screen((10, 10, 42, 22)) == BACKGROUND).all()
+
+
+def test_dirty_frames_match_full_redraws(game_context, dirty_tracking, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'spoof_mouse_position', None)
+    shown = {}
+    context = scene(game_context, shown)
+    frames = []
+    for index in range(6):
+        shown['b'] = index < 3
+        pe.settings.spoof_mouse_position = (20, 20) if index in (1, 4) else (150, 150)
+        context()
+        frames.append(screen((0, 0, 200, 200)))
+    monkeypatch.setattr(pe.settings, 'cb_dirty_tracking', False)
+    context = scene(game_context, shown)
+    for index, expected in enumerate(frames):
+        shown['b'] = index < 3
+        pe.settings.spoof_mouse_position = (20, 20) if index in (1, 4) else (150, 150)
+        pe.fill.full(BACKGROUND)
+        context()
+        assert numpy.array_equal(screen((0, 0, 200, 200)), expected), index
@@ -0,0 +1,69 @@
+import importlib.util
+import io
+import os
+
+import numpy
+from PIL import Image, ImageSequence
+
+# Importing the tester package reconfigures the cool buttons for the tester, so only its encoder module is loaded
+spec = importlib.util.spec_from_file_location('gif', os.path.join(
+    os.path.dirname(__file__), os.pardir, 'pygameextra_cool_buttons_tester', 'gif.py'))
+gif = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gif)
+GifWriter = gif.GifWriter
+
+
+def clip(count: int) -> list:
+    frames = []
+    for index in range(count):
+        frame = numpy.zeros((30, 40, 4), dtype=numpy.uint8)
+        frame[..., 0] = numpy.linspace(0, 200, 40, dtype=numpy.uint8)
+        frame[..., 1] = numpy.linspace(0, 60, 30, dtype=numpy.uint8)[:, numpy.newaxis]
+        # More colors than the palette holds, then colors that only show up after the palette window
+        frame[..., 2] = 100
+        if index >= 30:
+            frame[:, :8, 2] = 220
+        frames.append(frame)
+    return frames
+
+
+def decode(data: bytes) -> list:
+    return [numpy.asarray(frame.convert('RGB'), dtype=numpy.int16)
+            for frame in ImageSequence.Iterator(Image.open(io.BytesIO(data)))]
+
+
+def test_frames_are_streamed_with_a_bounded_buffer():
+    file = io.BytesIO()
+    writer = GifWriter(file, 50, palette_frames=4)
+    written = []
+    for frame in clip(40):
+        writer.add(frame)
+        assert len(writer.pending) < 4
+        written.append(file.tell())
+    writer.close()
+    # Everything after the palette window is written as it arrives
+    assert all(before < after for before, after in zip(written[4:], written[5:]))
+
+
+def test_late_colors_get_palette_entries():
+    frames = clip(40)
+    file = io.BytesIO()
+    writer = GifWriter(file, 50, palette_frames=4)
+    for frame in frames:
+        writer.add(frame)
+    writer.close()
+    decoded = decode(file.getvalue())
+    assert len(decoded) == len(frames)
+    for frame, result in zip(frames, decoded):
+        assert numpy.abs(result - frame[..., :3]).max() <= 12
+
+
+def test_short_clips_are_written_on_close():
+    frames = clip(3)
+    file = io.BytesIO()
+    writer = GifWriter(file, 50)
+    for frame in frames:
+        writer.add(frame)
+    assert file.tell() == 0
+    writer.close()
+    assert len(decode(file.getvalue())) == 3
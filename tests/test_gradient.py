@@ -0,0 +1,63 @@
+import numpy
+import pytest
+
+from pygameextra_cool_buttons.color import Color, GradientColor, PartialGradientColor
+
+# At most 240 per channel across the whole range, so one table step at the default resolution moves less than 1
+STOPS = ((0, (200, 0, 40)), (.25, (150, 60, 100)), (.75, (30, 180, 220)), (1, (0, 240, 200)))
+STEEP_STOPS = ((0, (255, 0, 0)), (.3, (0, 165, 255)), (.8, (20, 255, 40)), (1, (0, 0, 0)))
+
+
+def exact(percentage: float, stops: tuple = STOPS) -> tuple:
+    for (start, start_color), (end, end_color) in zip(stops, stops[1:]):
+        if percentage <= end:
+            t = (percentage - start) / (end - start)
+            return tuple(start_color[i] * (1 - t) + end_color[i] * t for i in range(3))
+    return stops[-1][1]
+
+
+def gradient(stops: tuple = STOPS, **kwargs) -> GradientColor:
+    # Stops are given out of order on purpose, the gradient sorts them
+    return GradientColor(*(PartialGradientColor(Color(color), stop) for stop, color in reversed(stops)), **kwargs)
+
+
+PERCENTAGES = numpy.linspace(0, 1, 1001)
+
+
+def test_lookup_matches_exact_interpolation():
+    color = gradient()
+    info = color.Info()
+    for percentage in PERCENTAGES:
+        assert numpy.allclose(color.get_color_at(percentage, info), exact(percentage), atol=2)
+
+
+def test_steep_stops_need_a_finer_table():
+    colors = gradient(STEEP_STOPS, resolution=4096).get_colors(PERCENTAGES)
+    assert numpy.allclose(colors[:, :3], [exact(percentage, STEEP_STOPS) for percentage in PERCENTAGES], atol=2)
+
+
+def test_batch_lookup_matches_exact_interpolation():
+    colors = gradient().get_colors(PERCENTAGES)
+    assert colors.shape == (len(PERCENTAGES), 4)
+    assert numpy.allclose(colors[:, :3], [exact(percentage) for percentage in PERCENTAGES], atol=2)
+    assert (colors[:, 3] == 255).all()
+
+
+def test_batch_lookup_matches_single_lookups():
+    color = gradient(resolution=64)
+    info = color.Info()
+    singles = [color.get_color_at(percentage, info) for percentage in PERCENTAGES]
+    assert numpy.array_equal(color.get_colors(PERCENTAGES)[:, :3], singles)
+
+
+def test_out_of_range_percentage_is_rejected():
+    with pytest.raises(ValueError):
+        gradient().get_color_at(1.5, None)
+    with pytest.raises(ValueError):
+        gradient().get_colors([-.1])
+
+
+@pytest.mark.parametrize('resolution', (0, 1))
+def test_resolution_below_two_is_rejected(resolution):
+    with pytest.raises(ValueError):
+        gradient(resolution=resolution)
@@ -0,0 +1,57 @@
+import math
+
+import numpy
+import pygame
+import pytest
+
+from pygameextra_cool_buttons import surfaces
+from pygameextra_cool_buttons.color import Color, GradientColor, GradientFill, PartialGradientColor
+
+from conftest import draw
+
+ROUNDED = (7, -1, -1, -1, -1)
+GRADIENT = GradientColor(PartialGradientColor(Color((200, 0, 40)), 0), PartialGradientColor(Color((30, 180, 220)), .6),
+                         PartialGradientColor(Color((0, 240, 200)), 1))
+FILLS = (GradientFill(GRADIENT), GradientFill(GRADIENT, angle=35), GradientFill(GRADIENT, angle=-120),
+         GradientFill(GRADIENT, GradientFill.RADIAL, center=(.3, .6)))
+
+
+@pytest.fixture
+def gradient_cache():
+    surfaces.gradients.clear()
+    yield surfaces.gradients
+    surfaces.gradients.clear()
+
+
+def percentage_at(fill: GradientFill, size: tuple, x: int, y: int) -> float:
+    width, height = size
+    dx, dy = x + .5 - width * fill.center[0], y + .5 - height * fill.center[1]
+    if fill.mode == GradientFill.RADIAL:
+        percentage = math.hypot(dx / (width / 2), dy / (height / 2))
+    else:
+        angle = math.radians(fill.angle)
+        extent = abs(width * math.cos(angle)) + abs(height * math.sin(angle))
+        percentage = (dx * math.cos(angle) + dy * math.sin(angle)) / extent + .5
+    return min(max(percentage, 0), 1)
+
+
+@pytest.mark.parametrize('fill', FILLS, ids=('linear', 'angled', 'reversed', 'radial'))
+def test_baked_gradient_matches_per_pixel_colors(fill):
+    size = (36, 20)
+    info = GRADIENT.Info()
+    info.sub_infos = [color.color.Info() for color in GRADIENT.colors]
+    expected = numpy.array([[GRADIENT.get_color_at(percentage_at(fill, size, x, y), info) for y in range(size[1])]
+                            for x in range(size[0])])
+    surface = surfaces.bake_gradient(fill, size, 0, *ROUNDED)
+    assert numpy.abs(pygame.surfarray.array3d(surface) - expected).max() <= 2
+    shape = surfaces.bake_rect((0, 0, 0, 255), size, 0, *ROUNDED)
+    assert numpy.array_equal(pygame.surfarray.array_alpha(surface), pygame.surfarray.array_alpha(shape))
+
+
+def test_gradient_is_baked_once_per_size(gradient_cache):
+    first = draw((60, 30), surfaces.rect, FILLS[1], (2, 3, 36, 20), 0, *ROUNDED)
+    second = draw((60, 30), surfaces.rect, FILLS[1], (20, 5, 36, 20), 0, *ROUNDED)
+    assert (gradient_cache.hits, gradient_cache.misses) == (1, 1)
+    assert numpy.array_equal(first[2:38, 3:23], second[20:56, 5:25])
+    draw((60, 30), surfaces.rect, FILLS[1], (2, 3, 30, 20), 0, *ROUNDED)
+    assert gradient_cache.misses == 2
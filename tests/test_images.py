@@ -0,0 +1,55 @@
+import numpy
+import pygame
+import pytest
+from pygameextra import display
+
+from pygameextra_cool_buttons import surfaces
+
+from conftest import draw
+
+AREA = (4, 6, 40, 24)
+
+
+@pytest.fixture
+def image_cache(game_context):
+    # Display conversion needs a display mode
+    game_context(lambda: None)
+    surfaces.scaled_images.clear()
+    yield surfaces.scaled_images
+    surfaces.scaled_images.clear()
+
+
+def source(alpha: bool) -> pygame.Surface:
+    surface = pygame.Surface((30, 12), pygame.SRCALPHA if alpha else 0)
+    pixels = numpy.indices((30, 12)).transpose(1, 2, 0)
+    pygame.surfarray.blit_array(surface, numpy.dstack((pixels[..., 0] * 8, pixels[..., 1] * 20, pixels[..., 0] * 3)))
+    if alpha:
+        pygame.surfarray.pixels_alpha(surface)[:] = 255 - pixels[..., 1] * 10
+    return surface
+
+
+def plain_image(surface: pygame.Surface, size: tuple):
+    scaled = pygame.transform.smoothscale(surface, size) if size != surface.get_size() else surface
+    display.display_reference.surface.blit(scaled, (AREA[0] + AREA[2] * .5 - size[0] * .5,
+                                                    AREA[1] + AREA[3] * .5 - size[1] * .5))
+
+
+@pytest.mark.parametrize('alpha', (False, True), ids=('opaque', 'alpha'))
+@pytest.mark.parametrize('image_scale, size', ((None, (30, 12)), ('stretch', (40, 24)), ('fit', (40, 16))))
+def test_cached_image_matches_plain_scaling(image_cache, alpha, image_scale, size):
+    image = source(alpha)
+    cached = draw((50, 40), surfaces.image, image, AREA, image_scale)
+    assert numpy.array_equal(cached, draw((50, 40), plain_image, image, size))
+
+
+def test_images_are_converted_once_per_size(image_cache):
+    image = source(True)
+    draw((50, 40), surfaces.image, image, AREA, 'stretch')
+    draw((50, 40), surfaces.image, image, (10, 10, 40, 24), 'stretch')
+    assert (image_cache.hits, image_cache.misses) == (1, 1)
+    draw((50, 40), surfaces.image, image, (10, 10, 20, 12), 'stretch')
+    assert image_cache.misses == 2
+    baked = list(image_cache.items.values())
+    screen = pygame.display.get_surface()
+    assert all(surface.get_bitsize() == screen.get_bitsize() and surface.get_flags() & pygame.SRCALPHA
+               for surface in baked)
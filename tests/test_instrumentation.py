@@ -0,0 +1,31 @@
+import pygameextra as pe
+
+from pygameextra_cool_buttons import instrumentation
+from pygameextra_cool_buttons.buttons import WrappedButtonClass
+
+
+def draw():
+    pe.button.rect((0, 0, 40, 20), (200, 40, 40), (40, 200, 40), shadow=True)
+
+
+def test_untimed_methods_are_not_wrapped(monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_instrumentation_timing', False)
+    assert not hasattr(WrappedButtonClass.render, '__wrapped__')
+    assert not hasattr(WrappedButtonClass.static_render, '__wrapped__')
+    monkeypatch.setattr(pe.settings, 'cb_instrumentation_timing', True)
+    assert hasattr(WrappedButtonClass.render, '__wrapped__')
+    assert hasattr(WrappedButtonClass.static_render, '__wrapped__')
+
+
+def test_timings_are_recorded_only_while_enabled(game_context, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_instrumentation', True)
+    context = game_context(draw)
+    context()
+    context()
+    assert instrumentation.history[-1].timings == []
+    monkeypatch.setattr(pe.settings, 'cb_instrumentation_timing', True)
+    context()
+    context()
+    phases = [timing.phase for timing in instrumentation.history[-1].timings]
+    assert sorted(phases) == ['render', 'static_render', 'static_render_text']
+    assert instrumentation.history[-1].counters['buttons_rendered'] == 1
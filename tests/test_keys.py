@@ -0,0 +1,76 @@
+import pygameextra as pe
+
+from pygameextra_cool_buttons import keys
+
+RED, GREEN = (200, 40, 40), (40, 200, 40)
+
+
+def run(game_context, loop, frames: int = 6):
+    history = []
+
+    def frame():
+        drawn = {}
+        loop(drawn, len(history))
+        history.append(drawn)
+
+    context = game_context(frame)
+    for _ in range(frames):
+        context()
+    return history
+
+
+def rect(drawn: dict, name: str, area: tuple, **kwargs):
+    pe.button.rect(area, RED, GREEN, **kwargs)
+    drawn[name] = pe.settings.game_context.buttons[-1]
+
+
+def assert_carried(history, name: str):
+    # Carrying over hands the previous button's state dict to the new one
+    infos = [drawn[name].infos for drawn in history]
+    assert all(info is infos[0] for info in infos)
+
+
+def test_call_site_keys_survive_conditional_buttons(game_context):
+    def loop(drawn, index):
+        rect(drawn, 'first', (0, 0, 20, 20))
+        if index % 2:
+            rect(drawn, 'sometimes', (0, 30, 20, 20))
+        rect(drawn, 'last', (0, 60, 20, 20))
+
+    history = run(game_context, loop)
+    assert_carried(history, 'first')
+    assert_carried(history, 'last')
+
+
+def test_buttons_from_one_call_site_are_told_apart_by_area(game_context):
+    def loop(drawn, index):
+        for y in (0, 30, 60):
+            if y == 30 and index % 2:
+                continue
+            rect(drawn, y, (0, y, 20, 20))
+
+    history = run(game_context, loop)
+    assert_carried(history, 0)
+    assert_carried(history, 60)
+
+
+def test_explicit_keys_follow_moving_buttons(game_context):
+    def loop(drawn, index):
+        if index % 2:
+            rect(drawn, 'other', (50, 0, 20, 20), key='other')
+        rect(drawn, 'moving', (index * 5, 0, 20, 20), key='moving')
+
+    history = run(game_context, loop)
+    assert_carried(history, 'moving')
+    assert all(drawn['moving'].cb_key == 'moving' for drawn in history)
+
+
+def test_duplicate_keys_get_numbered(game_context):
+    def loop(drawn, index):
+        rect(drawn, 'a', (0, 0, 20, 20), key='same')
+        rect(drawn, 'b', (0, 30, 20, 20), key='same')
+
+    history = run(game_context, loop)
+    assert [history[-1]['a'].cb_key, history[-1]['b'].cb_key] == ['same', ('same', 1)]
+    assert_carried(history, 'b')
+    assert keys.buttons_with_keys['same'] is history[-1]['a']
@@ -0,0 +1,40 @@
+import numpy
+import pytest
+from pygameextra import fill
+
+from pygameextra_cool_buttons import surfaces
+
+from conftest import draw
+
+ROUNDED = (0, 6, 2, -1, 9, -1)
+COLORS = ((200, 40, 40, 120), (40, 200, 40, 60), (200, 40, 40, 120), (10, 20, 30, 254))
+
+
+@pytest.fixture
+def mask_cache(monkeypatch):
+    monkeypatch.setattr(surfaces.settings, 'cb_mask_cache', True)
+    surfaces.masks.clear()
+    yield surfaces.masks
+    surfaces.masks.clear()
+
+
+def scene(color: tuple, area: tuple, *rect_args):
+    fill.full((90, 90, 200))
+    surfaces.rect(color, area, *rect_args)
+
+
+@pytest.mark.parametrize('rect_args', (ROUNDED, (3, 4, -1, -1, -1, -1)), ids=('filled', 'outline'))
+def test_tinted_mask_matches_direct_draw(mask_cache, monkeypatch, rect_args):
+    area = (3, 4, 30, 20)
+    tinted = [draw((40, 30), scene, color, area, *rect_args) for color in COLORS]
+    # One mask serves every color
+    assert (mask_cache.hits, mask_cache.misses) == (len(COLORS) - 1, 1)
+    monkeypatch.setattr(surfaces.settings, 'cb_mask_cache', False)
+    for color, result in zip(COLORS, tinted):
+        assert numpy.array_equal(result, draw((40, 30), scene, color, area, *rect_args)), color
+
+
+def test_opaque_colors_skip_the_mask(mask_cache):
+    draw((40, 30), scene, (200, 40, 40), (3, 4, 30, 20), *ROUNDED)
+    draw((40, 30), scene, (200, 40, 40, 255), (3, 4, 30, 20), *ROUNDED)
+    assert len(mask_cache) == 0
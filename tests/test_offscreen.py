@@ -0,0 +1,59 @@
+import numpy
+import pytest
+
+from pygameextra_cool_buttons import offscreen
+from pygameextra_cool_buttons.color import Color, GradientColor, PartialGradientColor, PulsingColor
+from pygameextra_cool_buttons.style import ButtonStyle
+
+SHADOW = ButtonStyle(shadow=True, edge_rounding=4, shadow_offset=(0, 3))
+SOFT = ButtonStyle(shadow=True, shadow_offset=(0, 0), shadow_blur=4, shadow_spread=2, shadow_color=(0, 0, 0, 255))
+PULSE = PulsingColor(GradientColor(PartialGradientColor(Color((0, 0, 0)), 0),
+                                   PartialGradientColor(Color((255, 255, 255)), 1)), 1, 1, 1)
+
+SPECS = [
+    dict(area=(0, 0, 40, 16), inactive_resource=(200, 0, 0), active_resource=(0, 0, 200)),
+    dict(area=(0, 0, 40, 16), inactive_resource=(200, 0, 0), active_resource=(0, 0, 200), hovered=True,
+         style=SHADOW),
+    dict(area=(2, 2, 30, 12), inactive_resource=(200, 0, 0), active_resource=(0, 0, 200), pressed=True,
+         style=SHADOW, text='Hi'),
+    dict(area=(0, 0, 40, 16), inactive_resource=PULSE, active_resource=PULSE, time=.5,
+         style=ButtonStyle(extra_kwargs={'inactive_resource_width': 2})),
+    dict(area=(0, 0, 20, 10), inactive_resource=(0, 200, 0), style=SOFT),
+]
+
+
+def test_batch_matches_single_renders():
+    batch = offscreen.render_batch(SPECS)
+    size = batch.shape[2], batch.shape[1]
+    assert batch.shape == (len(SPECS), 22, 40, 4)
+    for spec, frame in zip(SPECS, batch):
+        assert numpy.array_equal(frame, offscreen.render_to_array(size=size, **spec))
+
+
+def test_batch_fills_a_given_array():
+    out = numpy.zeros((len(SPECS), 24, 48, 4), dtype=numpy.uint8)
+    assert offscreen.render_batch(SPECS, size=(48, 24), out=out) is out
+    with pytest.raises(ValueError):
+        offscreen.render_batch(SPECS, size=(48, 24), out=out[:, :, :40])
+
+
+@pytest.mark.parametrize('key', ('size', 'out'))
+def test_batch_rejects_per_spec_shared_arguments(key):
+    with pytest.raises(ValueError, match=key):
+        offscreen.render_batch([dict(SPECS[0], **{key: None})])
+
+
+def test_shadow_beyond_the_origin_is_kept():
+    assert offscreen.get_offset((0, 0, 20, 10), SOFT) == (6, 6)
+    assert offscreen.get_size((0, 0, 20, 10), SOFT) == (32, 22)
+    pixels = offscreen.render_to_array((0, 0, 20, 10), (0, 200, 0), style=SOFT)
+    assert pixels.shape == (22, 32, 4)
+    assert pixels[0, :, 3].any() and pixels[:, 0, 3].any()
+    assert tuple(pixels[11, 16]) == (0, 200, 0, 255)
+
+
+def test_pressed_buttons_move_onto_their_shadow():
+    resting = offscreen.render_to_array(**SPECS[1])
+    pressed = offscreen.render_to_array(**dict(SPECS[1], pressed=True))
+    assert tuple(resting[1, 20]) == (0, 0, 200, 255)
+    assert tuple(pressed[1, 20]) != (0, 0, 200, 255) and tuple(pressed[4, 20]) == (0, 0, 200, 255)
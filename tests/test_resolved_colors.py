@@ -0,0 +1,41 @@
+import pygameextra as pe
+
+from pygameextra_cool_buttons.buttons import resolved_colors
+from pygameextra_cool_buttons.color import Color, GradientColor, PartialGradientColor, PulsingColor
+
+RED = Color((200, 40, 40))
+
+
+def test_static_colors_resolve_once_per_frame(game_context):
+    def loop():
+        for y in range(0, 100, 20):
+            pe.button.rect((0, y, 30, 15), RED, (40, 200, 40))
+
+    context = game_context(loop)
+    context()
+    hits, misses = resolved_colors.hits, resolved_colors.misses
+    context()
+    assert resolved_colors.misses - misses == 1
+    assert resolved_colors.hits - hits >= 4
+    assert list(resolved_colors.items) == [(RED, None)]
+
+
+def test_animated_colors_resolve_per_button(game_context):
+    pulse = PulsingColor(GradientColor(PartialGradientColor(Color((0, 0, 0)), 0),
+                                       PartialGradientColor(Color((255, 255, 255)), 1)), 1, 0, 1)
+    drawn = []
+
+    def loop():
+        pe.button.rect((0, 0, 30, 15), pulse, (40, 200, 40), key='first')
+        if len(drawn) > 3:
+            pe.button.rect((0, 20, 30, 15), pulse, (40, 200, 40), key='late')
+        drawn.append(list(pe.settings.game_context.buttons))
+
+    context = game_context(loop)
+    for _ in range(8):
+        context()
+    first, late = drawn[-1]
+    # Each button keeps its own pulse, the late one started four frames after the first
+    assert first.infos['self_inactive_resource'] is not late.infos['self_inactive_resource']
+    assert first.infos['self_inactive_resource'].percentage > late.infos['self_inactive_resource'].percentage
+    assert len(resolved_colors.items) == 2
@@ -0,0 +1,50 @@
+import numpy
+import pygameextra as pe
+
+from pygameextra_cool_buttons.cb import RetainedButton
+
+RED, GREEN = (200, 40, 40), (40, 200, 40)
+
+
+def frames(game_context, loop, count: int = 8) -> list:
+    context = game_context(loop)
+    screens = []
+    for index in range(count):
+        pe.settings.spoof_mouse_position = (10, 10) if index % 4 in (1, 2) else (150, 150)
+        context()
+        screens.append(pe.pygame.surfarray.array3d(pe.display.display_reference.surface))
+    pe.settings.spoof_mouse_position = None
+    return screens
+
+
+def test_retained_buttons_draw_like_the_function_api(game_context):
+    immediate = frames(game_context, lambda: (
+        pe.button.rect((0, 0, 40, 20), RED, GREEN, shadow=True, edge_rounding=4),
+        pe.button.rect((0, 30, 40, 20), RED, GREEN, inactive_resource_width=2, active_resource_width=4),
+    ))
+    buttons = (RetainedButton((0, 0, 40, 20), RED, GREEN, shadow=True, edge_rounding=4),
+               RetainedButton((0, 30, 40, 20), RED, GREEN, inactive_resource_width=2, active_resource_width=4))
+    retained = frames(game_context, lambda: [button() for button in buttons])
+    assert all(numpy.array_equal(a, b) for a, b in zip(immediate, retained))
+
+
+def test_retained_buttons_persist(game_context):
+    button = RetainedButton((0, 0, 40, 20), RED, GREEN, shadow=True)
+    seen = set()
+
+    def loop():
+        button()
+        seen.add(id(pe.settings.game_context.buttons[-1]))
+
+    frames(game_context, loop, 4)
+    assert seen == {id(button.button)}
+
+
+def test_update_only_changes_what_differs():
+    button = RetainedButton((0, 0, 40, 20), RED, GREEN, inactive_resource_width=1)
+    style = button.button.style
+    button.update(area=(0, 0, 40, 20), inactive_resource_width=1, shadow=None)
+    assert button.button.style is style
+    button.update(inactive_resource_width=3, shadow=True, tag='new')
+    assert button.button.style.extra_kwargs['inactive_resource_width'] == 3
+    assert button.button.shadow is True and button.button.tag == 'new'
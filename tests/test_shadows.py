@@ -0,0 +1,54 @@
+import numpy
+import pygame
+import pytest
+
+from pygameextra_cool_buttons import surfaces
+
+from conftest import draw
+
+ROUNDED = (6, -1, -1, -1, -1)
+
+
+@pytest.fixture
+def shadow_cache():
+    surfaces.shadows.clear()
+    yield surfaces.shadows
+    surfaces.shadows.clear()
+
+
+def reference_alpha(size: tuple, blur_radius: int, spread: int) -> numpy.ndarray:
+    # Full 2D convolution of the spread shape, without the separable passes or the cache
+    shape = surfaces.bake_rect((0, 0, 0, 255), (size[0] + spread * 2, size[1] + spread * 2), 0, 6 + spread)
+    alpha = numpy.pad(pygame.surfarray.array_alpha(shape).astype(numpy.float64), blur_radius * 2)
+    kernel = surfaces.gaussian_kernel(blur_radius).astype(numpy.float64)
+    width, height = alpha.shape[0] - blur_radius * 2, alpha.shape[1] - blur_radius * 2
+    blurred = numpy.zeros((width, height))
+    for x, weight_x in enumerate(kernel):
+        for y, weight_y in enumerate(kernel):
+            blurred += weight_x * weight_y * alpha[x:x + width, y:y + height]
+    return blurred
+
+
+@pytest.mark.parametrize('blur_radius, spread', ((4, 0), (3, 2), (8, 1)))
+def test_blurred_shadow_matches_direct_convolution(shadow_cache, blur_radius, spread):
+    size = (30, 16)
+    mask = surfaces.bake_shadow(size, 0, blur_radius, spread, *ROUNDED)
+    alpha = pygame.surfarray.array_alpha(mask.surface).astype(numpy.int16)
+    assert numpy.abs(alpha - reference_alpha(size, blur_radius, spread)).max() <= 1
+
+
+def test_cached_shadow_matches_a_fresh_bake(shadow_cache):
+    area = (12, 10, 30, 16)
+    colors = ((0, 0, 0, 80), (200, 40, 40, 120), (0, 0, 0, 80))
+    cached = [draw((60, 40), surfaces.shadow, color, area, 0, 4, 2, *ROUNDED) for color in colors]
+    assert (shadow_cache.hits, shadow_cache.misses) == (2, 1)
+    for color, result in zip(colors, cached):
+        shadow_cache.clear()
+        assert numpy.array_equal(result, draw((60, 40), surfaces.shadow, color, area, 0, 4, 2, *ROUNDED))
+
+
+def test_unblurred_shadow_is_the_hard_shape(shadow_cache):
+    area = (12, 10, 30, 16)
+    assert numpy.array_equal(draw((60, 40), surfaces.shadow, (0, 0, 0, 80), area, 0, 0, 0, *ROUNDED),
+                             draw((60, 40), surfaces.rect, (0, 0, 0, 80), area, 0, *ROUNDED))
+    assert len(shadow_cache) == 0
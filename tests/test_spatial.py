@@ -0,0 +1,55 @@
+import numpy
+import pygameextra as pe
+import pytest
+
+RED, GREEN = (200, 40, 40), (40, 200, 40)
+POSITIONS = ((5, 5), (25, 15), (25, 15), (48, 24), (52, 28), (120, 70), (121, 71), (61, 12), (190, 190))
+
+
+def grid():
+    for index in range(12):
+        x, y = index % 4 * 45, index // 4 * 25
+        # Neighbouring shadows overlap, so the topmost button has to win
+        pe.button.rect((x, y, 50, 24), RED, GREEN, shadow=True, shadow_offset=(6, 6))
+
+
+def hover_frames(game_context, monkeypatch, spatial: bool, loop=grid) -> list:
+    monkeypatch.setattr(pe.settings, 'cb_spatial_hover', spatial)
+    monkeypatch.setattr(pe.settings, 'cb_spatial_cell_size', 32)
+    context = game_context(loop)
+    frames = []
+    for position in POSITIONS:
+        pe.settings.spoof_mouse_position = position
+        context()
+        frames.append(([button.hovered for button in context.buttons],
+                       pe.pygame.surfarray.array3d(pe.display.display_reference.surface)))
+    pe.settings.spoof_mouse_position = None
+    return frames
+
+
+@pytest.mark.parametrize('loop', (grid, lambda: [grid(), pe.button.rect((20, 10, 80, 40), GREEN, RED)]),
+                         ids=('grid', 'overlay'))
+def test_spatial_hover_matches_per_button_hover(game_context, monkeypatch, loop):
+    plain = hover_frames(game_context, monkeypatch, False, loop)
+    spatial = hover_frames(game_context, monkeypatch, True, loop)
+    for (plain_hovered, plain_screen), (spatial_hovered, spatial_screen) in zip(plain, spatial):
+        assert plain_hovered == spatial_hovered
+        assert numpy.array_equal(plain_screen, spatial_screen)
+
+
+def test_index_is_rebuilt_only_when_the_layout_or_mouse_changes(game_context, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_spatial_hover', True)
+    monkeypatch.setattr(pe.settings, 'spoof_mouse_position', (25, 15))
+    moved = []
+    context = game_context(lambda: [grid(), pe.button.rect((100 + len(moved), 80, 20, 20), RED, GREEN)])
+    context()
+    index = context.button_manager.cb_spatial_index
+    layout, candidates = index.layout, index.candidates
+    context()
+    assert index.layout is layout and index.candidates is candidates
+    pe.settings.spoof_mouse_position = (26, 15)
+    context()
+    assert index.layout is layout and index.candidates is not candidates
+    moved.append(True)
+    context()
+    assert index.layout is not layout
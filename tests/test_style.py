@@ -0,0 +1,65 @@
+import pygameextra.settings as settings
+import pytest
+
+from pygameextra_cool_buttons.style import DEFAULT_STYLE, ButtonStyle
+
+
+def test_equal_styles_hash_alike():
+    a = ButtonStyle(shadow=True, shadow_color=[0, 0, 0, 80], extra_kwargs={'inactive_resource_width': 2})
+    b = ButtonStyle(shadow=True, shadow_color=(0, 0, 0, 80), extra_kwargs={'inactive_resource_width': 2})
+    assert a == b and hash(a) == hash(b)
+    assert a != b.replace(shadow_offset=(1, 1))
+    assert a != b.replace(extra_kwargs={'inactive_resource_width': 3})
+
+
+def test_styles_are_immutable():
+    with pytest.raises(AttributeError):
+        DEFAULT_STYLE.shadow = True
+
+
+def test_unhashable_extra_kwargs_compare_by_identity():
+    tags = ['a']
+    a = ButtonStyle(extra_kwargs={'tags': tags})
+    assert a == ButtonStyle(extra_kwargs={'tags': tags}) and hash(a) == hash(ButtonStyle(extra_kwargs={'tags': tags}))
+    assert a != ButtonStyle(extra_kwargs={'tags': ['a']})
+    assert a.override(shadow=True).extra_kwargs['tags'] is tags
+
+
+def test_override_reuses_styles():
+    assert DEFAULT_STYLE.override() is DEFAULT_STYLE
+    style = DEFAULT_STYLE.override(shadow=True, edge_rounding=4, extra_kwargs={'active_resource_width': 1})
+    assert style is DEFAULT_STYLE.override(shadow=True, edge_rounding=4, extra_kwargs={'active_resource_width': 1})
+    assert style == ButtonStyle(shadow=True, edge_rounding=4, extra_kwargs={'active_resource_width': 1})
+
+
+def test_override_keeps_unset_fields():
+    base = ButtonStyle(shadow=True, edge_rounding=6, extra_kwargs={'a': 1})
+    style = base.override(shadow_offset=(0, 3), extra_kwargs={'b': 2})
+    assert (style.shadow, style.edge_rounding, style.shadow_offset) == (True, 6, (0, 3))
+    assert dict(style.extra_kwargs) == {'a': 1, 'b': 2}
+
+
+def test_resolve_fills_defaults_from_settings():
+    resolved = ButtonStyle(edge_rounding=3).resolved
+    assert resolved.edge_rounding == 3
+    assert resolved.shadow_color == settings.cb_default_shadow_color
+    assert resolved.shadow_offset == settings.cb_default_shadow_offset
+    assert resolved.resolved is resolved
+
+
+def test_resolve_is_invalidated_when_defaults_change(monkeypatch):
+    style = ButtonStyle(edge_rounding=3)
+    resolved = style.resolved
+    assert style.resolved is resolved
+    version = settings.cb_settings_version
+    monkeypatch.setattr(settings, 'cb_default_shadow_offset', (5, 5))
+    assert settings.cb_settings_version > version
+    assert style.resolved is not resolved and style.resolved.shadow_offset == (5, 5)
+    monkeypatch.setattr(settings, 'cb_surface_cache', not settings.cb_surface_cache)
+    assert style.resolved.shadow_offset == (5, 5)
+
+
+def test_explicit_values_win_over_defaults(monkeypatch):
+    monkeypatch.setattr(settings, 'cb_default_shadow', True)
+    assert ButtonStyle().resolved.shadow is True
+    assert ButtonStyle(shadow=False).resolved.shadow is False
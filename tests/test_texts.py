@@ -0,0 +1,43 @@
+import numpy
+import pygameextra as pe
+import pytest
+
+from pygameextra_cool_buttons import texts
+
+LABELS = [str(number) for number in range(40)]
+
+
+@pytest.fixture
+def text_cache():
+    texts.cached_texts.clear()
+    yield texts.cached_texts
+    texts.cached_texts.clear()
+
+
+@pytest.mark.parametrize('colors, antialias', ((((255, 255, 255), None), True), (([200, 40, 40], (0, 0, 0)), False)))
+def test_cached_text_matches_plain_text(text_cache, colors, antialias):
+    cached = texts.text('Hello, PGE!', font_size=14, colors=colors, antialias=antialias)
+    plain = pe.Text('Hello, PGE!', font_size=14, colors=colors, antialias=antialias)
+    assert numpy.array_equal(pe.pygame.surfarray.array3d(cached.obj), pe.pygame.surfarray.array3d(plain.obj))
+    assert texts.text('Hello, PGE!', font_size=14, colors=colors, antialias=antialias) is cached
+    assert (text_cache.hits, text_cache.misses) == (1, 1)
+
+
+def test_cache_stays_within_its_byte_budget(text_cache, monkeypatch):
+    budget = sum(texts.surface_bytes(pe.Text(label, font_size=14)) for label in LABELS[:10])
+    monkeypatch.setattr(pe.settings, 'cb_text_cache_bytes', budget)
+    for label in LABELS:
+        texts.text(label, font_size=14)
+        assert text_cache.bytes <= budget
+        assert text_cache.bytes == sum(text_cache.sizes.values())
+    assert text_cache.evictions == len(LABELS) - len(text_cache)
+    assert text_cache.evicted_bytes == sum(texts.surface_bytes(pe.Text(label, font_size=14)) for label in LABELS) - \
+        text_cache.bytes
+    # The most recent labels are the ones kept
+    assert [key[0] for key in text_cache.items] == LABELS[-len(text_cache):]
+
+
+def test_text_larger_than_the_budget_is_not_kept(text_cache, monkeypatch):
+    monkeypatch.setattr(pe.settings, 'cb_text_cache_bytes', 16)
+    assert texts.text('Too wide for the budget', font_size=14).obj.get_width()
+    assert len(text_cache) == 0 and text_cache.bytes == 0